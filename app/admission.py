@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from .deadline import Deadline, deadline_scope
+from .metrics import metrics
+
+
+class Overloaded(RuntimeError):
+    pass
+
+
+class AdmissionController:
+    """Bounds how many queries run at once and how many may wait for a slot.
+
+    Requests beyond ``max_concurrency + max_queue`` are rejected immediately
+    instead of slowing every in-flight query down; queued requests give up
+    once their deadline passes.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, request_timeout: float) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.request_timeout = request_timeout
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._admitted = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Requests running or waiting for a slot."""
+        return self._admitted
+
+    @asynccontextmanager
+    async def admit(self, deadline: Deadline) -> AsyncIterator[None]:
+        if self._admitted >= self.max_concurrency + self.max_queue:
+            metrics.inc("query_rejected_total", reason="overloaded")
+            raise Overloaded("Too many queries in progress, please retry shortly.")
+
+        self._admitted += 1
+        try:
+            queued = time.perf_counter()
+            async with deadline_scope(deadline):
+                await self._slots.acquire()
+            metrics.observe("query_queue_wait_seconds", time.perf_counter() - queued)
+            try:
+                yield
+            finally:
+                self._slots.release()
+        finally:
+            self._admitted -= 1
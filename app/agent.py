@@ -1,6 +1,7 @@
+from .deadline import Deadline, deadline_scope
 from .models import AgentResult
 from .query_parser import BookingQueryInterpreter
-from .services import BookingService, BookingSummary
+from .services import BookingComparison, BookingService, BookingSummary
 
 
 class BookingQueryAgent:
@@ -8,19 +9,57 @@ class BookingQueryAgent:
         self.interpreter = interpreter
         self.booking_service = booking_service
 
-    async def run(self, query: str) -> AgentResult:
-        filters = self.interpreter.interpret(query)
-        summary: BookingSummary = await self.booking_service.summarize_bookings(filters)
+    async def run(self, query: str, deadline: Deadline | None = None) -> AgentResult:
+        # Everything below (parsing, fetching, FX) is cancelled once the
+        # deadline passes; HTTP and LLM calls also cap their own timeouts to it.
+        async with deadline_scope(deadline):
+            filters = await self.interpreter.interpret(query)
+
+            comparison: BookingComparison | None = None
+            if filters.is_comparison:
+                comparison = await self.booking_service.compare_bookings(filters)
+                summary: BookingSummary = comparison.current
+            else:
+                summary = await self.booking_service.summarize_bookings(filters)
 
         msg = (
             f"The total value of bookings between "
             f"{filters.start_date.isoformat()} and {filters.end_date.isoformat()} "
-            f"was {summary.total_value:,.2f} {summary.currency}."
+            f"was {summary.total_value:,.2f} {summary.currency}"
         )
 
+        if summary.per_account:
+            msg += f" ({self._breakdown(summary)})"
+
+        if comparison is not None:
+            previous = comparison.previous
+            msg += (
+                f", compared with {previous.total_value:,.2f} {previous.currency} between "
+                f"{filters.compare_start_date.isoformat()} and {filters.compare_end_date.isoformat()}"
+            )
+            if previous.per_account:
+                msg += f" ({self._breakdown(previous)})"
+
+            msg += f": a change of {comparison.delta_value:+,.2f} {summary.currency}"
+            if comparison.delta_percent is not None:
+                msg += f" ({comparison.delta_percent:+.2f}%)"
+
+        msg += "."
+
         return AgentResult(
             message=msg,
             filters=filters,
             total_value=summary.total_value,
             currency=summary.currency,
+            per_account=summary.per_account,
+            compare_total_value=comparison.previous.total_value if comparison else None,
+            delta_value=comparison.delta_value if comparison else None,
+            delta_percent=comparison.delta_percent if comparison else None,
+        )
+
+    @staticmethod
+    def _breakdown(summary: BookingSummary) -> str:
+        return "; ".join(
+            f"{account}: {value:,.2f} {summary.currency}"
+            for account, value in summary.per_account.items()
         )
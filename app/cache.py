@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Tuple
+
+Compute = Callable[[], Awaitable[bytes]]
+
+
+class _KeyedLocks:
+    """One asyncio.Lock per key, dropped again once nobody holds or waits on it."""
+
+    def __init__(self) -> None:
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._users: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._users[key] = self._users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._users[key] -= 1
+            if not self._users[key]:
+                del self._users[key]
+                del self._locks[key]
+
+
+class CacheBackend(ABC):
+    """Byte-valued cache shared by the repository, FX and interpreter layers.
+
+    ``get_or_compute`` guarantees that concurrent callers for the same key
+    trigger a single ``compute``; shared backends extend that guarantee
+    across processes.
+    """
+
+    def __init__(self) -> None:
+        self._key_locks = _KeyedLocks()
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        ...
+
+    async def get_or_compute(self, key: str, compute: Compute, ttl: float | None = None) -> bytes:
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        async with self._key_locks.hold(key):
+            value = await self.get(key)
+            if value is not None:
+                return value
+            return await self._compute_and_store(key, compute, ttl)
+
+    async def _compute_and_store(self, key: str, compute: Compute, ttl: float | None) -> bytes:
+        value = await compute()
+        await self.set(key, value, ttl)
+        return value
+
+    async def aclose(self) -> None:
+        pass
+
+
+class NullCacheBackend(CacheBackend):
+    async def get(self, key: str) -> bytes | None:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process LRU cache bounded by entry count and by the total size of
+    the stored values. Concurrent callers are deduplicated per process only."""
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 64 * 1024 * 1024) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, Tuple[float | None, bytes]] = OrderedDict()
+        self._bytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def _drop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        if key in self._entries:
+            self._drop(key)
+        # A value that alone exceeds the budget would evict everything else.
+        if len(value) > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._bytes += len(value)
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache stored in an SQLite database in WAL mode, shared by every process
+    that opens the same file.
+
+    Cross-process get-or-compute uses a lease row: the process that inserts it
+    computes the value, while the others poll until the value appears or the
+    lease expires (e.g. because its owner crashed) and they can take it over.
+    """
+
+    _PURGE_EVERY = 256
+
+    def __init__(
+            self,
+            path: str,
+            lease_timeout: float = 30.0,
+            poll_interval: float = 0.05,
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        self._owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            "key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _run(self, fn: Callable[[sqlite3.Connection], object], write: bool = True) -> object:
+        with self._lock:
+            if not write:
+                return fn(self._conn)
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    @staticmethod
+    def _read(conn: sqlite3.Connection, key: str, now: float) -> bytes | None:
+        row = conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= now):
+            return None
+        return row[0]
+
+    def _write(self, conn: sqlite3.Connection, key: str, value: bytes, ttl: float | None, now: float) -> None:
+        expires_at = now + ttl if ttl is not None else None
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+
+        self._writes += 1
+        if self._writes % self._PURGE_EVERY == 0:
+            conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            conn.execute("DELETE FROM leases WHERE expires_at <= ?", (now,))
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(
+            self._run, lambda conn: self._read(conn, key, time.time()), False
+        )
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        await asyncio.to_thread(
+            self._run, lambda conn: self._write(conn, key, value, ttl, time.time())
+        )
+
+    def _try_lease(self, conn: sqlite3.Connection, key: str) -> Tuple[bytes | None, bool]:
+        now = time.time()
+
+        value = self._read(conn, key, now)
+        if value is not None:
+            return value, False
+
+        lease = conn.execute("SELECT owner, expires_at FROM leases WHERE key = ?", (key,)).fetchone()
+        if lease is not None and lease[1] > now and lease[0] != self._owner:
+            return None, False
+
+        conn.execute(
+            "INSERT OR REPLACE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)",
+            (key, self._owner, now + self.lease_timeout),
+        )
+        return None, True
+
+    def _store_and_release(self, conn: sqlite3.Connection, key: str, value: bytes, ttl: float | None) -> None:
+        self._write(conn, key, value, ttl, time.time())
+        conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner))
+
+    def _release(self, conn: sqlite3.Connection, key: str) -> None:
+        conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner))
+
+    async def _compute_and_store(self, key: str, compute: Compute, ttl: float | None) -> bytes:
+        while True:
+            value, acquired = await asyncio.to_thread(
+                self._run, lambda conn: self._try_lease(conn, key)
+            )
+            if value is not None:
+                return value
+            if acquired:
+                break
+            await asyncio.sleep(self.poll_interval)
+
+        try:
+            value = await compute()
+        except BaseException:
+            await asyncio.to_thread(self._run, lambda conn: self._release(conn, key))
+            raise
+
+        await asyncio.to_thread(
+            self._run, lambda conn: self._store_and_release(conn, key, value, ttl)
+        )
+        return value
+
+    async def aclose(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_cache_backend(
+        kind: str,
+        path: str | None = None,
+        max_bytes: int = 64 * 1024 * 1024,
+) -> CacheBackend:
+    kind = kind.lower()
+    if kind == "memory":
+        return InMemoryCacheBackend(max_bytes=max_bytes)
+    if kind == "sqlite":
+        if not path:
+            raise ValueError("cache_path must be set to use the sqlite cache backend")
+        return SQLiteCacheBackend(path)
+    if kind == "none":
+        return NullCacheBackend()
+    raise ValueError(f"Unknown cache backend: {kind!r}")
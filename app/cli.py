@@ -0,0 +1,168 @@
+"""Answer many booking queries offline, without going through /query.
+
+Reads one JSON object per line with a ``query`` field (other fields are
+passed through), runs the queries concurrently against the configured Turneo
+accounts and caches, and writes one JSON result per line in input order.
+
+    python -m app.cli queries.jsonl > results.jsonl
+    cat queries.jsonl | python -m app.cli --concurrency 16 -
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, TextIO
+
+from .agent import BookingQueryAgent
+from .config import get_settings
+from .container import AppContainer
+from .deadline import Deadline
+from .logging_config import configure_logging
+from .metrics import percentile
+
+
+@dataclass
+class BatchStats:
+    ok: int = 0
+    failed: int = 0
+    latencies: List[float] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.ok + self.failed
+
+
+async def _answer(
+        agent: BookingQueryAgent,
+        line: str,
+        semaphore: asyncio.Semaphore,
+        timeout: float | None,
+        stats: BatchStats,
+) -> Dict[str, Any]:
+    try:
+        row = json.loads(line)
+        query = row["query"]
+    except (ValueError, TypeError, KeyError):
+        stats.failed += 1
+        return {"input": line, "error": "Expected a JSON object with a 'query' field"}
+
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            result = await agent.run(query, deadline=Deadline(timeout) if timeout else None)
+        except Exception as e:
+            stats.failed += 1
+            return {**row, "error": str(e) or type(e).__name__}
+        finally:
+            stats.latencies.append(time.perf_counter() - started)
+
+    stats.ok += 1
+    return {
+        **row,
+        "message": result.message,
+        "start_date": result.filters.start_date.isoformat(),
+        "end_date": result.filters.end_date.isoformat(),
+        "total_value": result.total_value,
+        "currency": result.currency,
+        "per_account": result.per_account,
+        "compare_total_value": result.compare_total_value,
+        "delta_value": result.delta_value,
+        "delta_percent": result.delta_percent,
+    }
+
+
+async def run_batch(
+        agent: BookingQueryAgent,
+        source: TextIO,
+        sink: TextIO,
+        concurrency: int = 8,
+        timeout: float | None = None,
+) -> BatchStats:
+    """Stream results to ``sink`` in input order while keeping at most
+    ``concurrency`` queries running and ``2 * concurrency`` buffered."""
+    stats = BatchStats()
+    semaphore = asyncio.Semaphore(concurrency)
+    pending: Deque[asyncio.Task] = deque()
+    started = time.perf_counter()
+
+    async def flush(keep: int) -> None:
+        while len(pending) > keep:
+            sink.write(json.dumps(await pending.popleft()) + "\n")
+        sink.flush()
+
+    while True:
+        # stdin may be a slow pipe; don't block the queries already running.
+        line = await asyncio.to_thread(source.readline)
+        if not line:
+            break
+        if not line.strip():
+            continue
+
+        pending.append(asyncio.create_task(_answer(agent, line.strip(), semaphore, timeout, stats)))
+        if len(pending) >= 2 * concurrency:
+            await flush(concurrency)
+
+    await flush(0)
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def _report(stats: BatchStats) -> str:
+    rate = stats.total / stats.elapsed if stats.elapsed else 0.0
+    p50 = percentile(stats.latencies, 50) or 0.0
+    p95 = percentile(stats.latencies, 95) or 0.0
+    return (
+        f"{stats.total} queries ({stats.ok} ok, {stats.failed} failed) in {stats.elapsed:.2f}s: "
+        f"{rate:.1f} queries/s, latency p50 {p50 * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms"
+    )
+
+
+async def _main(args: argparse.Namespace) -> int:
+    settings = get_settings()
+    configure_logging(
+        level=settings.log_level,
+        fmt=settings.log_format,
+        sample_burst=settings.log_sample_burst,
+        sample_interval=settings.log_sample_interval_seconds,
+    )
+
+    # One container for the whole batch, so every query shares the booking,
+    # FX and parsed-query caches.
+    container = AppContainer(settings)
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        stats = await run_batch(
+            container.agent,
+            source,
+            sys.stdout,
+            concurrency=args.concurrency,
+            timeout=args.timeout,
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        await container.aclose()
+
+    print(_report(stats), file=sys.stderr)
+    return 1 if stats.failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Answer booking queries from an NDJSON file")
+    parser.add_argument("input", nargs="?", default="-", help="NDJSON of {query, ...}; '-' for stdin")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=None, help="per-query deadline in seconds")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,72 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import List
+
+from pydantic import BaseModel, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class TurneoAccount(BaseModel):
+    name: str
+    api_key: str
+    api_root: str | None = None
+
+
 class Settings(BaseSettings):
     # Turneo API
     turneo_api_root: str = "https://api.san.turneo.co"
-    turneo_api_key: str
+    turneo_api_key: str | None = None
+    # Several accounts as JSON, e.g. '[{"name": "eu", "api_key": "..."}]'.
+    # When set, every query is answered across all of them.
+    turneo_accounts: List[TurneoAccount] = []
+    turneo_max_concurrency_per_account: int = 4
+    # Hedging: a page GET slower than the observed percentile for its endpoint
+    # is sent again, and the first answer wins. Hedges are capped at
+    # turneo_hedge_budget_ratio of all page requests, across all accounts.
+    turneo_hedging_enabled: bool = False
+    turneo_hedge_percentile: float = 95.0
+    turneo_hedge_budget_ratio: float = 0.05
 
     # FX Rates API
     fx_api_root: str | None = None
     fx_api_key: str | None = None
 
+    # Cache shared by the repository, FX and interpreter layers.
+    # "memory" is per worker; "sqlite" shares one WAL database file between
+    # all workers on the host; "none" disables caching.
+    cache_backend: str = "memory"
+    cache_path: str | None = None
+    # Upper bound on the values held by the "memory" backend, per worker.
+    cache_max_bytes: int = 64 * 1024 * 1024
+    booking_cache_ttl_seconds: float = 300.0
+    fx_cache_ttl_seconds: float = 3600.0
+    query_cache_ttl_seconds: float = 86400.0
+    # How long ETag/Last-Modified validators and their page bodies are kept.
+    http_validator_ttl_seconds: float = 30 * 86400.0
+
+    # Background warm-up of hot periods and FX tables. Keep the interval plus
+    # jitter below booking_cache_ttl_seconds so those periods never go cold.
+    cache_warmer_enabled: bool = False
+    cache_warm_periods: List[str] = ["this_month", "last_month"]
+    cache_warm_interval_seconds: float = 240.0
+    cache_warm_jitter_seconds: float = 30.0
+    cache_warm_concurrency: int = 2
+
+    # Admission control for /query: beyond max concurrency plus queue depth,
+    # requests get 503 straight away. Each request, including its time in the
+    # queue, is cancelled after query_timeout_seconds.
+    query_max_concurrency: int = 16
+    query_max_queue: int = 32
+    query_timeout_seconds: float = 30.0
+
+    # Logging: "json" or "text". Each message type is limited to
+    # log_sample_burst records per log_sample_interval_seconds (0 disables).
+    log_level: str = "INFO"
+    log_format: str = "json"
+    log_sample_burst: int = 10
+    log_sample_interval_seconds: float = 60.0
+
     # LLM
     openai_api_key: str | None = None
     openai_model: str = "gpt-4o-mini"
@@ -22,5 +77,17 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    @model_validator(mode="after")
+    def _require_turneo_credentials(self) -> "Settings":
+        if not self.turneo_api_key and not self.turneo_accounts:
+            raise ValueError("Either TURNEO_API_KEY or TURNEO_ACCOUNTS must be set")
+
+        names = [account.name for account in self.turneo_accounts]
+        if len(names) != len(set(names)):
+            raise ValueError("TURNEO_ACCOUNTS names must be unique")
+        return self
+
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
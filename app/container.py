@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+from functools import cached_property
+
+from .admission import AdmissionController
+from .agent import BookingQueryAgent
+from .cache import CacheBackend, create_cache_backend
+from .config import Settings, TurneoAccount
+from .fx_client import FXClient
+from .hedging import RequestHedger
+from .query_parser import (SUPPORTED_CURRENCIES, BookingQueryInterpreter,
+                           BookingQueryParser, OpenAIQueryParser,
+                           RuleBasedQueryParser)
+from .repositories import (MultiAccountBookingRepository,
+                           TurneoBookingRepository)
+from .services import BookingService
+from .turneo_client import TurneoClient
+from .warmer import CacheWarmer
+
+logger = logging.getLogger(__name__)
+
+
+class AppContainer:
+    """Builds the application object graph on first use instead of at import."""
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+
+    @cached_property
+    def cache(self) -> CacheBackend:
+        return create_cache_backend(
+            self.settings.cache_backend,
+            self.settings.cache_path,
+            max_bytes=self.settings.cache_max_bytes,
+        )
+
+    @cached_property
+    def parser(self) -> BookingQueryParser:
+        if self.settings.openai_api_key:
+            return OpenAIQueryParser(
+                api_key=self.settings.openai_api_key,
+                model=self.settings.openai_model,
+            )
+        return RuleBasedQueryParser()
+
+    @cached_property
+    def interpreter(self) -> BookingQueryInterpreter:
+        return BookingQueryInterpreter(
+            self.parser,
+            cache=self.cache,
+            cache_ttl=self.settings.query_cache_ttl_seconds,
+        )
+
+    @cached_property
+    def turneo_hedger(self) -> RequestHedger | None:
+        if not self.settings.turneo_hedging_enabled:
+            return None
+        # Shared by all accounts so the hedge budget is global.
+        return RequestHedger(
+            "turneo",
+            pct=self.settings.turneo_hedge_percentile,
+            budget_ratio=self.settings.turneo_hedge_budget_ratio,
+        )
+
+    def _turneo_repo(self, account: TurneoAccount) -> TurneoBookingRepository:
+        client = TurneoClient(
+            base_url=account.api_root or self.settings.turneo_api_root,
+            api_key=account.api_key,
+            cache=self.cache,
+            validator_ttl=self.settings.http_validator_ttl_seconds,
+            hedger=self.turneo_hedger,
+        )
+        return TurneoBookingRepository(
+            client,
+            cache=self.cache,
+            cache_ttl=self.settings.booking_cache_ttl_seconds,
+            cache_namespace=account.name,
+        )
+
+    @cached_property
+    def booking_repo(self) -> TurneoBookingRepository | MultiAccountBookingRepository:
+        if not self.settings.turneo_accounts:
+            return self._turneo_repo(
+                TurneoAccount(name="default", api_key=self.settings.turneo_api_key)
+            )
+
+        return MultiAccountBookingRepository(
+            {account.name: self._turneo_repo(account) for account in self.settings.turneo_accounts},
+            max_concurrency_per_account=self.settings.turneo_max_concurrency_per_account,
+        )
+
+    @cached_property
+    def fx_client(self) -> FXClient:
+        return FXClient(
+            base_url=self.settings.fx_api_root,
+            api_key=self.settings.fx_api_key,
+            cache=self.cache,
+            cache_ttl=self.settings.fx_cache_ttl_seconds,
+            validator_ttl=self.settings.http_validator_ttl_seconds,
+        )
+
+    @cached_property
+    def booking_service(self) -> BookingService:
+        return BookingService(repo=self.booking_repo, fx_client=self.fx_client)
+
+    @cached_property
+    def agent(self) -> BookingQueryAgent:
+        return BookingQueryAgent(self.interpreter, self.booking_service)
+
+    @cached_property
+    def admission(self) -> AdmissionController:
+        return AdmissionController(
+            max_concurrency=self.settings.query_max_concurrency,
+            max_queue=self.settings.query_max_queue,
+            request_timeout=self.settings.query_timeout_seconds,
+        )
+
+    @cached_property
+    def cache_warmer(self) -> CacheWarmer:
+        s = self.settings
+        if s.cache_warm_interval_seconds + s.cache_warm_jitter_seconds >= s.booking_cache_ttl_seconds:
+            logger.warning(
+                "Cache warm interval (%.0fs + %.0fs jitter) is not below the booking cache TTL "
+                "(%.0fs); warmed periods can expire between refreshes.",
+                s.cache_warm_interval_seconds,
+                s.cache_warm_jitter_seconds,
+                s.booking_cache_ttl_seconds,
+            )
+
+        return CacheWarmer(
+            repo=self.booking_repo,
+            fx_client=self.fx_client,
+            cache=self.cache,
+            periods=s.cache_warm_periods,
+            currencies=SUPPORTED_CURRENCIES,
+            interval=s.cache_warm_interval_seconds,
+            jitter=s.cache_warm_jitter_seconds,
+            concurrency=s.cache_warm_concurrency,
+            ttl=s.booking_cache_ttl_seconds,
+        )
+
+    def preload(self) -> None:
+        # Pulls heavy SDK imports forward; meant to run off the event loop
+        # once the worker is already accepting requests.
+        if isinstance(self.parser, OpenAIQueryParser):
+            self.parser.client
+
+    async def aclose(self) -> None:
+        if "cache_warmer" in self.__dict__:
+            await self.cache_warmer.stop()
+        if "cache" in self.__dict__:
+            await self.cache.aclose()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Deadline:
+    """An absolute point in time by which a request must be answered."""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def clamp(self, timeout: float | None) -> float:
+        """Shrink a per-call timeout to what is left of the deadline."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Request deadline of {self.timeout:.1f}s exceeded")
+        return remaining if timeout is None else min(timeout, remaining)
+
+
+_current: ContextVar[Deadline | None] = ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    """The deadline of the request being served, if any. Context variables are
+    copied into tasks and ``asyncio.to_thread`` calls, so every layer below
+    :func:`deadline_scope` sees it without threading it through signatures."""
+    return _current.get()
+
+
+@asynccontextmanager
+async def deadline_scope(deadline: Deadline | None) -> AsyncIterator[None]:
+    """Cancel the enclosed work once ``deadline`` passes, raising
+    :class:`DeadlineExceeded`. A ``None`` deadline keeps the current one."""
+    if deadline is None:
+        yield
+        return
+
+    token = _current.set(deadline)
+    try:
+        async with asyncio.timeout(deadline.remaining()):
+            yield
+    except TimeoutError as e:
+        if isinstance(e, DeadlineExceeded):
+            raise
+        raise DeadlineExceeded(f"Request deadline of {deadline.timeout:.1f}s exceeded") from e
+    finally:
+        _current.reset(token)
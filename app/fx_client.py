@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Protocol
+import json
+from typing import Any, Dict, Iterable, List, Protocol
 
 import httpx
 
-from .config import settings
+from .cache import CacheBackend
+from .http_cache import ConditionalFetcher
 
 
 class FXRateProvider(Protocol):
@@ -14,9 +16,19 @@ class FXRateProvider(Protocol):
 
 class FXClient(FXRateProvider):
 
-    def __init__(self) -> None:
-        self.base_url = (settings.fx_api_root or "").rstrip("/")
-        self.api_key = settings.fx_api_key or None
+    def __init__(
+            self,
+            base_url: str | None = None,
+            api_key: str | None = None,
+            cache: CacheBackend | None = None,
+            cache_ttl: float = 3600.0,
+            validator_ttl: float | None = None,
+    ) -> None:
+        self.base_url = (base_url or "").rstrip("/")
+        self.api_key = api_key or None
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self._fetcher = ConditionalFetcher("fx", cache=cache, ttl=validator_ttl)
 
     async def get_rate(self, from_currency: str, to_currency: str) -> float:
         from_currency = from_currency.upper()
@@ -25,15 +37,56 @@ class FXClient(FXRateProvider):
         if from_currency == to_currency:
             return 1.0
 
-        if not self.base_url or not self.api_key:
+        if not self.is_configured():
             raise RuntimeError(
                 "FX client is not configured but a conversion from "
                 f"{from_currency} to {to_currency} was requested."
             )
 
+        if self.cache is None:
+            return (await self._fetch_rates(from_currency, [to_currency]))[to_currency]
+
+        async def compute() -> bytes:
+            rates = await self._fetch_rates(from_currency, [to_currency])
+            return repr(rates[to_currency]).encode()
+
+        value = await self.cache.get_or_compute(
+            self._cache_key(from_currency, to_currency), compute, self.cache_ttl
+        )
+        return float(value)
+
+    async def refresh_rates(self, from_currency: str, to_currencies: Iterable[str]) -> Dict[str, float]:
+        """Fetch the rate table for one base currency and store every pair in the cache."""
+        from_currency = from_currency.upper()
+        targets = [c.upper() for c in to_currencies if c.upper() != from_currency]
+        if not targets:
+            return {}
+
+        rates = await self._fetch_rates(from_currency, targets)
+        if self.cache is not None:
+            for to_currency, rate in rates.items():
+                await self.cache.set(
+                    self._cache_key(from_currency, to_currency), repr(rate).encode(), self.cache_ttl
+                )
+        return rates
+
+    def is_configured(self) -> bool:
+        return bool(self.base_url and self.api_key)
+
+    @staticmethod
+    def _cache_key(from_currency: str, to_currency: str) -> str:
+        return f"fx:{from_currency}:{to_currency}"
+
+    async def _fetch_rates(self, from_currency: str, to_currencies: List[str]) -> Dict[str, float]:
+        if not self.is_configured():
+            raise RuntimeError(
+                "FX client is not configured but a conversion from "
+                f"{from_currency} to {', '.join(to_currencies)} was requested."
+            )
+
         params: Dict[str, Any] = {
             "base": from_currency,
-            "currencies": to_currency,
+            "currencies": ",".join(to_currencies),
             "format": "json",
         }
 
@@ -42,8 +95,7 @@ class FXClient(FXRateProvider):
 
         async with httpx.AsyncClient(timeout=10.0) as client:
             try:
-                resp = await client.get(f"{self.base_url}/latest", params=params)
-                resp.raise_for_status()
+                content = await self._fetcher.get(client, f"{self.base_url}/latest", params=params)
             except httpx.RequestError as e:
                 raise RuntimeError(f"Failed to contact FX API: {e}") from e
             except httpx.HTTPStatusError as e:
@@ -51,14 +103,17 @@ class FXClient(FXRateProvider):
                     f"FX API returned error status {e.response.status_code}: {e.response.text}"
                 ) from e
 
-            data: Dict[str, Any] = resp.json()
+            data: Dict[str, Any] = json.loads(content)
 
         if not data.get("success", False):
             raise ValueError(f"FX API error: {data}")
 
         rates = data.get("rates", {})
-        rate = rates.get(to_currency)
-        if rate is None:
-            raise ValueError(f"No FX rate for {from_currency}->{to_currency} in response")
-
-        return float(rate)
+        result: Dict[str, float] = {}
+        for to_currency in to_currencies:
+            rate = rates.get(to_currency)
+            if rate is None:
+                raise ValueError(f"No FX rate for {from_currency}->{to_currency} in response")
+            result[to_currency] = float(rate)
+
+        return result
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, TypeVar
+
+from .metrics import metrics, percentile
+
+T = TypeVar("T")
+
+
+async def _cancel(*tasks: asyncio.Task) -> None:
+    # Wait for the losers to unwind so their connections are released before
+    # the caller closes the client.
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+class RequestHedger:
+    """Sends a second copy of a slow request and takes whichever answers first.
+
+    A request is hedged once it has been outstanding longer than the observed
+    ``pct`` latency percentile of its endpoint. Every request earns
+    ``budget_ratio`` hedge tokens (up to ``max_tokens``) and every hedge spends
+    one, so hedges never exceed that fraction of upstream traffic.
+    """
+
+    def __init__(
+            self,
+            upstream: str,
+            pct: float = 95.0,
+            budget_ratio: float = 0.05,
+            max_tokens: float = 10.0,
+            min_delay: float = 0.05,
+            min_samples: int = 20,
+            window: int = 256,
+    ) -> None:
+        self.upstream = upstream
+        self.pct = pct
+        self.budget_ratio = budget_ratio
+        self.max_tokens = max_tokens
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._tokens = 0.0
+
+    def threshold(self, endpoint: str) -> float | None:
+        """Delay before hedging, or None until enough latencies are known."""
+        samples = self._latencies.get(endpoint)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        return max(self.min_delay, percentile(list(samples), self.pct))
+
+    def _record(self, endpoint: str, seconds: float) -> None:
+        samples = self._latencies.get(endpoint)
+        if samples is None:
+            samples = self._latencies[endpoint] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def _take_token(self) -> bool:
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    async def run(self, endpoint: str, send: Callable[[], Awaitable[T]]) -> T:
+        labels = {"upstream": self.upstream, "endpoint": endpoint}
+        delay = self.threshold(endpoint)
+        self._tokens = min(self.max_tokens, self._tokens + self.budget_ratio)
+        metrics.inc("upstream_hedgeable_requests_total", **labels)
+
+        started = time.perf_counter()
+        primary = asyncio.create_task(send())
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done:
+                    if self._take_token():
+                        return await self._race(primary, send, started, labels)
+                    metrics.inc("upstream_hedges_skipped_total", reason="budget", **labels)
+
+            result = await primary
+        finally:
+            await _cancel(primary)
+
+        elapsed = time.perf_counter() - started
+        self._record(endpoint, elapsed)
+        metrics.observe("upstream_request_seconds", elapsed, **labels)
+        return result
+
+    async def _race(
+            self,
+            primary: asyncio.Task,
+            send: Callable[[], Awaitable[T]],
+            started: float,
+            labels: Dict[str, str],
+    ) -> T:
+        metrics.inc("upstream_hedges_total", **labels)
+        hedge = asyncio.create_task(send())
+        attempts = {primary, hedge}
+
+        winner: asyncio.Task | None = None
+        try:
+            while attempts and winner is None:
+                done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+        finally:
+            await _cancel(primary, hedge)
+
+        if winner is None:
+            # Both copies failed; report the original request's error.
+            return primary.result()
+
+        if winner is hedge:
+            metrics.inc("upstream_hedge_wins_total", **labels)
+        # Recorded from the primary's start whichever copy won: the hedge's own
+        # latency would drag the threshold down and make hedging more eager.
+        elapsed = time.perf_counter() - started
+        self._record(labels["endpoint"], elapsed)
+        metrics.observe("upstream_request_seconds", elapsed, **labels)
+        return winner.result()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+from importlib.util import find_spec
+from typing import Any, Dict, Mapping
+
+import httpx
+import msgspec
+
+from .cache import CacheBackend
+from .deadline import DeadlineExceeded, current_deadline
+from .hedging import RequestHedger
+from .metrics import metrics
+
+# httpx only decodes brotli when a brotli package is installed, so only
+# advertise it when it is.
+ACCEPT_ENCODING = (
+    "br, gzip, deflate"
+    if find_spec("brotli") or find_spec("brotlicffi")
+    else "gzip, deflate"
+)
+
+
+class _StoredPage(msgspec.Struct):
+    body: bytes
+    wire_bytes: int = 0
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+_encoder = msgspec.msgpack.Encoder()
+_decoder = msgspec.msgpack.Decoder(_StoredPage)
+
+
+def _copy_request(request: httpx.Request) -> httpx.Request:
+    # A request belongs to the attempt that sends it (httpx binds its stream
+    # and extensions), so a hedged GET sends a fresh copy each time.
+    return httpx.Request(
+        request.method,
+        request.url,
+        headers=request.headers,
+        extensions=dict(request.extensions),
+    )
+
+
+class ConditionalFetcher:
+    """GETs pages with compression and with the ETag/Last-Modified validators
+    stored for each URL, reusing the stored body on 304 Not Modified.
+
+    ``namespace`` separates credentials that see different data behind the
+    same URL (the Turneo API key travels in a header, not in the URL).
+    With a ``hedger``, slow requests are duplicated per its policy.
+    """
+
+    def __init__(
+            self,
+            upstream: str,
+            cache: CacheBackend | None = None,
+            ttl: float | None = None,
+            namespace: str = "",
+            hedger: RequestHedger | None = None,
+    ) -> None:
+        self.upstream = upstream
+        self.cache = cache
+        self.ttl = ttl
+        self.namespace = namespace
+        self.hedger = hedger
+
+    def _cache_key(self, url: httpx.URL) -> str:
+        digest = hashlib.sha256(str(url).encode("utf-8")).hexdigest()
+        return f"http:{self.upstream}:{self.namespace}:{digest}"
+
+    async def get(
+            self,
+            client: httpx.AsyncClient,
+            url: str,
+            headers: Mapping[str, str] | None = None,
+            params: Dict[str, Any] | None = None,
+    ) -> bytes:
+        # Each call gets at most what is left of the request deadline.
+        deadline = current_deadline()
+        timeout = deadline.clamp(client.timeout.read) if deadline else httpx.USE_CLIENT_DEFAULT
+
+        request = client.build_request("GET", url, headers=headers, params=params, timeout=timeout)
+        request.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+        key = self._cache_key(request.url)
+        stored: _StoredPage | None = None
+        if self.cache is not None:
+            raw = await self.cache.get(key)
+            if raw is not None:
+                stored = _decoder.decode(raw)
+                if stored.etag:
+                    request.headers["If-None-Match"] = stored.etag
+                if stored.last_modified:
+                    request.headers["If-Modified-Since"] = stored.last_modified
+
+        try:
+            if self.hedger is not None:
+                # Latencies differ per host (accounts may use different API
+                # roots), so the endpoint includes it.
+                endpoint = f"{request.url.host}{request.url.path}"
+                resp = await self.hedger.run(endpoint, lambda: client.send(_copy_request(request)))
+            else:
+                resp = await client.send(request)
+        except httpx.TimeoutException as e:
+            if deadline is not None and deadline.remaining() <= 0:
+                raise DeadlineExceeded(f"Request deadline of {deadline.timeout:.1f}s exceeded") from e
+            raise
+
+        metrics.inc("upstream_requests_total", upstream=self.upstream)
+        metrics.inc("upstream_bytes_received_total", resp.num_bytes_downloaded, upstream=self.upstream)
+
+        if resp.status_code == 304 and stored is not None:
+            metrics.inc("upstream_not_modified_total", upstream=self.upstream)
+            metrics.inc(
+                "upstream_bytes_saved_total",
+                max(0, stored.wire_bytes - resp.num_bytes_downloaded),
+                upstream=self.upstream,
+            )
+            return stored.body
+
+        resp.raise_for_status()
+        body = resp.content
+        metrics.inc("upstream_bytes_decoded_total", len(body), upstream=self.upstream)
+
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if self.cache is not None and (etag or last_modified):
+            page = _StoredPage(
+                body=body,
+                wire_bytes=resp.num_bytes_downloaded,
+                etag=etag,
+                last_modified=last_modified,
+            )
+            await self.cache.set(key, _encoder.encode(page), self.ttl)
+
+        return body
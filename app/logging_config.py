@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Any, Dict, TextIO, Tuple
+
+from .metrics import metrics
+
+# Attributes every LogRecord has; anything else was passed via ``extra=``.
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any ``extra=`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class _DeferredFormatQueueHandler(QueueHandler):
+    """Queues records with their message resolved but their traceback left
+    for the listener to format, unlike ``QueueHandler`` which formats the
+    whole record on the calling thread and drops ``exc_info``."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Arguments may be mutable objects that change before the listener
+        # gets to them, so the message itself is resolved here.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Lets through at most ``burst`` records of each message type per
+    ``interval`` seconds and drops the rest.
+
+    The message type is the unformatted template, so ``logger.warning("x %s",
+    v)`` is one type whatever ``v`` is. The first record let through after a
+    drop carries the number of dropped records as ``suppressed``.
+    """
+
+    def __init__(self, burst: int = 10, interval: float = 60.0) -> None:
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._lock = threading.Lock()
+        # key -> (window start, records let through, records dropped)
+        self._windows: Dict[Tuple[str, int, Any], Tuple[float, int, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+
+        with self._lock:
+            if key not in self._windows and len(self._windows) >= 4096:
+                # Guard against templates that embed values (f-strings).
+                self._windows.clear()
+            started, allowed, dropped = self._windows.get(key, (now, 0, 0))
+            if now - started >= self.interval:
+                started, allowed = now, 0
+
+            if allowed >= self.burst:
+                self._windows[key] = (started, allowed, dropped + 1)
+                metrics.inc("log_records_suppressed_total", logger=record.name)
+                return False
+
+            self._windows[key] = (started, allowed + 1, 0)
+
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+_listener: QueueListener | None = None
+_handler: _DeferredFormatQueueHandler | None = None
+
+
+def configure_logging(
+        level: str | int = logging.INFO,
+        fmt: str = "json",
+        sample_burst: int = 10,
+        sample_interval: float = 60.0,
+        stream: TextIO | None = None,
+) -> None:
+    """Route all logging through a queue so callers never block on the
+    stream; a background thread formats and writes the records.
+
+    Safe to call again (e.g. once settings are loaded): the previous queue
+    is flushed and replaced.
+    """
+    global _listener, _handler
+
+    root = logging.getLogger()
+    if _listener is not None:
+        _listener.stop()
+        root.removeHandler(_handler)
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    queue: SimpleQueue = SimpleQueue()
+    _handler = _DeferredFormatQueueHandler(queue)
+    # Filtering runs before the record is formatted, so dropped records never
+    # pay for %-formatting.
+    if sample_burst > 0:
+        _handler.addFilter(SamplingFilter(sample_burst, sample_interval))
+
+    _listener = QueueListener(queue, output, respect_handler_level=True)
+    _listener.start()
+
+    root.addHandler(_handler)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener, _handler
+
+    if _listener is not None:
+        _listener.stop()
+        logging.getLogger().removeHandler(_handler)
+        _listener = _handler = None
+
+
+atexit.register(shutdown_logging)
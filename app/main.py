@@ -1,39 +1,68 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
 
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse
+
+from .admission import AdmissionController, Overloaded
 from .agent import AgentResult, BookingQueryAgent
-from .config import settings
-from .fx_client import FXClient
-from .query_parser import (BookingQueryInterpreter, BookingQueryParser,
-                           OpenAIQueryParser, RuleBasedQueryParser)
-from .repositories import BookingRepository, TurneoBookingRepository
+from .config import get_settings
+from .container import AppContainer
+from .deadline import Deadline, DeadlineExceeded
+from .logging_config import configure_logging
+from .metrics import metrics
 from .schemas import QueryRequest, QueryResponse
-from .services import BookingService
-from .turneo_client import TurneoClient
 
-app = FastAPI(title="Turneo Booking Agent Demo")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    configure_logging(
+        level=settings.log_level,
+        fmt=settings.log_format,
+        sample_burst=settings.log_sample_burst,
+        sample_interval=settings.log_sample_interval_seconds,
+    )
 
-def create_parser() -> BookingQueryParser:
-    if settings.openai_api_key:
-        return OpenAIQueryParser(
-            api_key=settings.openai_api_key
-        )
-    return RuleBasedQueryParser()
+    container = AppContainer(settings)
+    # Cheap to build; doing it here surfaces configuration errors at boot.
+    container.agent
+    app.state.container = container
 
+    if container.settings.cache_warmer_enabled:
+        container.cache_warmer.start()
 
-llm_client = create_parser()
-interpreter = BookingQueryInterpreter(llm_client)
+    preload = asyncio.create_task(asyncio.to_thread(container.preload))
+    yield
+    if not preload.done():
+        preload.cancel()
+    await container.aclose()
 
-turneo_client = TurneoClient()
-booking_repo: BookingRepository = TurneoBookingRepository(turneo_client)
 
-fx_client = FXClient()
+app = FastAPI(title="Turneo Booking Agent Demo", lifespan=lifespan)
 
-booking_service = BookingService(repo=booking_repo, fx_client=fx_client)
+DISCONNECT_POLL_SECONDS = 0.5
 
-agent = BookingQueryAgent(interpreter, booking_service)
 
-from fastapi.responses import HTMLResponse
+def get_container(request: Request) -> AppContainer:
+    return request.app.state.container
+
+
+def get_agent(container: AppContainer = Depends(get_container)) -> BookingQueryAgent:
+    return container.agent
+
+
+def get_admission(container: AppContainer = Depends(get_container)) -> AdmissionController:
+    return container.admission
+
+
+async def _cancel_on_disconnect(request: Request, work: asyncio.Task) -> bool:
+    while not work.done():
+        if await request.is_disconnected():
+            work.cancel()
+            return True
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+    return False
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -85,15 +114,50 @@ async def home():
     """
 
 
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
+
+
 @app.post("/query", response_model=QueryResponse)
-async def handle_query(body: QueryRequest):
+async def handle_query(
+        body: QueryRequest,
+        request: Request,
+        agent: BookingQueryAgent = Depends(get_agent),
+        admission: AdmissionController = Depends(get_admission),
+):
+    # The deadline starts on arrival, so time spent queued counts against it.
+    deadline = Deadline(admission.request_timeout)
+
+    async def run() -> AgentResult:
+        async with admission.admit(deadline):
+            return await agent.run(body.query, deadline=deadline)
+
+    work = asyncio.create_task(run())
+    watcher = asyncio.create_task(_cancel_on_disconnect(request, work))
     try:
-        result: AgentResult = await agent.run(body.query)
+        result: AgentResult = await work
+    except asyncio.CancelledError:
+        if watcher.done() and not watcher.cancelled() and watcher.result():
+            metrics.inc("query_cancelled_total", reason="disconnect")
+            raise HTTPException(status_code=499, detail="Client closed request")
+        raise
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except DeadlineExceeded as e:
+        metrics.inc("query_cancelled_total", reason="deadline")
+        raise HTTPException(status_code=504, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        watcher.cancel()
 
     return QueryResponse(
         message=result.message,
         total_value=result.total_value,
         currency=result.currency,
-    )
\ No newline at end of file
+        per_account=result.per_account,
+        compare_total_value=result.compare_total_value,
+        delta_value=result.delta_value,
+        delta_percent=result.delta_percent,
+    )
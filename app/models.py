@@ -1,19 +1,275 @@
+from array import array
 from dataclasses import dataclass
 from datetime import date
+from typing import Dict, Iterable, Iterator, List, Tuple
 
+import msgspec
 
-@dataclass
+# ISO 4217 minor-unit exponents that differ from the usual 2 decimals.
+CURRENCY_EXPONENTS = {
+    "JPY": 0,
+    "KRW": 0,
+    "ISK": 0,
+    "BHD": 3,
+    "KWD": 3,
+    "OMR": 3,
+}
+
+
+def currency_exponent(currency: str) -> int:
+    return CURRENCY_EXPONENTS.get(currency, 2)
+
+
+@dataclass(slots=True)
 class Booking:
     id: str
     check_in: date
     currency: str
     amount: float
+    account: str | None = None
+
+
+# Ranges of the array typecodes used by BookingBatch.
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+_UINT16_MAX = 2 ** 16 - 1
+_UINT32_MAX = 2 ** 32 - 1
+
+
+class _Interner:
+    __slots__ = ("values", "lookup")
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values: List[str] = list(values)
+        self.lookup: Dict[str, int] = {v: i for i, v in enumerate(self.values)}
+
+    def can_intern(self, value: str, limit: int) -> bool:
+        """Whether ``value`` has, or would get, an index no greater than ``limit``."""
+        return self.can_intern_all([value], limit)
+
+    def can_intern_all(self, values: Iterable[str], limit: int) -> bool:
+        new = len({v for v in values if v not in self.lookup})
+        return len(self.values) + new - 1 <= limit
+
+    def __call__(self, value: str) -> int:
+        idx = self.lookup.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self.values.append(value)
+            self.lookup[value] = idx
+        return idx
+
+
+class BookingBatch:
+    """Struct-of-arrays storage: day ordinals, integer minor-unit amounts,
+    interned currency codes and account names, and ids packed into one
+    UTF-8 buffer. Iterating yields ``Booking`` views built on demand.
+    """
+
+    __slots__ = (
+        "_id_data",
+        "_id_offsets",
+        "_days",
+        "_amounts",
+        "_currency_idx",
+        "_currencies",
+        "_account_idx",
+        "_accounts",
+    )
+
+    def __init__(self) -> None:
+        self._id_data = bytearray()
+        self._id_offsets = array("I", [0])
+        self._days = array("i")
+        self._amounts = array("q")
+        self._currency_idx = array("H")
+        self._currencies = _Interner()
+        self._account_idx = array("H")
+        # Index 0 is "no account", so untagged bookings need no lookup.
+        self._accounts = _Interner([""])
+
+    @classmethod
+    def from_bookings(cls, bookings: Iterable[Booking]) -> "BookingBatch":
+        if isinstance(bookings, BookingBatch):
+            return bookings
+
+        batch = cls()
+        for b in bookings:
+            batch.append(b.id, b.check_in, b.currency, b.amount, b.account)
+        return batch
+
+    def append(
+            self,
+            id: str,
+            check_in: date,
+            currency: str,
+            amount: float,
+            account: str | None = None,
+    ) -> None:
+        # Validate everything before touching the arrays so a bad row
+        # never leaves the columns with different lengths.
+        code = currency.upper()
+        account = account or ""
+        minor = round(amount * 10 ** currency_exponent(code))
+        day = check_in.toordinal()
+        encoded_id = str(id).encode("utf-8")
+
+        if not _INT64_MIN <= minor <= _INT64_MAX:
+            raise OverflowError(f"Booking amount {amount!r} {code} is out of range")
+        if not self._currencies.can_intern(code, _UINT16_MAX):
+            raise OverflowError("Too many distinct currencies in one batch")
+        if not self._accounts.can_intern(account, _UINT16_MAX):
+            raise OverflowError("Too many distinct accounts in one batch")
+        if len(self._id_data) + len(encoded_id) > _UINT32_MAX:
+            raise OverflowError("Booking ids exceed the batch id buffer")
+
+        self._days.append(day)
+        self._amounts.append(minor)
+        self._currency_idx.append(self._currencies(code))
+        self._account_idx.append(self._accounts(account))
+        self._id_data += encoded_id
+        self._id_offsets.append(len(self._id_data))
+
+    def extend(self, other: "BookingBatch", account: str | None = None) -> None:
+        """Append all rows of ``other``, optionally re-tagging them with ``account``."""
+        # As in append: check every limit before interning or writing anything.
+        accounts = [account] if account is not None else other._accounts.values
+        if not self._currencies.can_intern_all(other._currencies.values, _UINT16_MAX):
+            raise OverflowError("Too many distinct currencies in one batch")
+        if not self._accounts.can_intern_all(accounts, _UINT16_MAX):
+            raise OverflowError("Too many distinct accounts in one batch")
+        if len(self._id_data) + len(other._id_data) > _UINT32_MAX:
+            raise OverflowError("Booking ids exceed the batch id buffer")
+
+        currency_map = [self._currencies(code) for code in other._currencies.values]
+        if account is not None:
+            tagged = self._accounts(account)
+            account_map = [tagged] * len(other._accounts.values)
+        else:
+            account_map = [self._accounts(name) for name in other._accounts.values]
+
+        base = len(self._id_data)
+        self._id_data += other._id_data
+        self._id_offsets.extend(base + off for off in other._id_offsets[1:])
+        self._days.extend(other._days)
+        self._amounts.extend(other._amounts)
+        self._currency_idx.extend(currency_map[i] for i in other._currency_idx)
+        self._account_idx.extend(account_map[i] for i in other._account_idx)
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def __getitem__(self, i: int) -> Booking:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("BookingBatch index out of range")
+
+        currency = self._currencies.values[self._currency_idx[i]]
+        return Booking(
+            id=self._id_data[self._id_offsets[i]:self._id_offsets[i + 1]].decode("utf-8"),
+            check_in=date.fromordinal(self._days[i]),
+            currency=currency,
+            amount=self._amounts[i] / 10 ** currency_exponent(currency),
+            account=self._accounts.values[self._account_idx[i]] or None,
+        )
+
+    def __iter__(self) -> Iterator[Booking]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def currencies(self) -> List[str]:
+        return list(self._currencies.values)
+
+    @property
+    def accounts(self) -> List[str]:
+        return [name for name in self._accounts.values if name]
+
+    def totals_by_currency(self) -> Dict[str, float]:
+        """Sum amounts per currency in exact integer minor units."""
+        minor_totals = [0] * len(self._currencies.values)
+        for idx, minor in zip(self._currency_idx, self._amounts):
+            minor_totals[idx] += minor
+
+        return {
+            code: minor_totals[idx] / 10 ** currency_exponent(code)
+            for idx, code in enumerate(self._currencies.values)
+        }
+
+    def totals_by_account_currency(self) -> Dict[str | None, Dict[str, float]]:
+        minor_totals: Dict[Tuple[int, int], int] = {}
+        for key, minor in zip(zip(self._account_idx, self._currency_idx), self._amounts):
+            minor_totals[key] = minor_totals.get(key, 0) + minor
+
+        totals: Dict[str | None, Dict[str, float]] = {}
+        for (account_idx, currency_idx), minor in minor_totals.items():
+            account = self._accounts.values[account_idx] or None
+            code = self._currencies.values[currency_idx]
+            totals.setdefault(account, {})[code] = minor / 10 ** currency_exponent(code)
+        return totals
+
+    def to_bytes(self) -> bytes:
+        return msgspec.msgpack.encode(
+            {
+                "v": 2,
+                "currencies": self._currencies.values,
+                "accounts": self._accounts.values,
+                "ids": bytes(self._id_data),
+                "id_offsets": self._id_offsets.tobytes(),
+                "days": self._days.tobytes(),
+                "amounts": self._amounts.tobytes(),
+                "currency_idx": self._currency_idx.tobytes(),
+                "account_idx": self._account_idx.tobytes(),
+            }
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BookingBatch":
+        raw = msgspec.msgpack.decode(data)
+        if raw.get("v") not in (1, 2):
+            raise ValueError(f"Unsupported BookingBatch format: {raw.get('v')!r}")
+
+        batch = cls()
+        batch._currencies = _Interner(raw["currencies"])
+        batch._id_data = bytearray(raw["ids"])
+        batch._id_offsets = array("I", raw["id_offsets"])
+        batch._days = array("i", raw["days"])
+        batch._amounts = array("q", raw["amounts"])
+        batch._currency_idx = array("H", raw["currency_idx"])
+
+        if raw["v"] == 1:
+            # Written before bookings carried an account: all untagged.
+            batch._account_idx = array("H", bytes(2 * len(batch._days)))
+        else:
+            batch._accounts = _Interner(raw["accounts"])
+            batch._account_idx = array("H", raw["account_idx"])
+        return batch
+
+    def nbytes(self) -> int:
+        """Approximate payload size of the column buffers in bytes."""
+        return (
+            len(self._id_data)
+            + self._id_offsets.itemsize * len(self._id_offsets)
+            + self._days.itemsize * len(self._days)
+            + self._amounts.itemsize * len(self._amounts)
+            + self._currency_idx.itemsize * len(self._currency_idx)
+            + self._account_idx.itemsize * len(self._account_idx)
+        )
 
 
 @dataclass
 class BookingSummary:
     total_value: float
     currency: str
+    per_account: Dict[str, float] | None = None
+
+
+@dataclass
+class BookingComparison:
+    current: BookingSummary
+    previous: BookingSummary
+    delta_value: float
+    delta_percent: float | None = None
 
 
 @dataclass
@@ -21,6 +277,12 @@ class QueryFilters:
     start_date: date
     end_date: date
     target_currency: str
+    compare_start_date: date | None = None
+    compare_end_date: date | None = None
+
+    @property
+    def is_comparison(self) -> bool:
+        return self.compare_start_date is not None and self.compare_end_date is not None
 
 
 @dataclass
@@ -29,3 +291,7 @@ class AgentResult:
     filters: QueryFilters | None = None
     total_value: float | None = None
     currency: str | None = None
+    per_account: Dict[str, float] | None = None
+    compare_total_value: float | None = None
+    delta_value: float | None = None
+    delta_percent: float | None = None
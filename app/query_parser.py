@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import re
 from abc import ABC, abstractmethod
 from calendar import monthrange
 from datetime import date
-from typing import NotRequired, TypedDict
-
-from openai import OpenAI
+from typing import TYPE_CHECKING, Callable, List, NotRequired, Tuple, TypedDict
 
+from .cache import CacheBackend
+from .deadline import DeadlineExceeded, current_deadline
 from .models import QueryFilters
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +24,9 @@ class ParsedQuery(TypedDict):
     start_date: str
     end_date: str
     currency: NotRequired[str]
+    # Second period of a comparison query ("November 2024 vs November 2023").
+    compare_start_date: NotRequired[str]
+    compare_end_date: NotRequired[str]
 
 
 class BookingQueryParser(ABC):
@@ -53,25 +61,55 @@ SUPPORTED_CURRENCIES = [
 ]
 
 
+PERIOD_PATTERN = re.compile(
+    r"(?P<month>january|february|march|april|may|june|july|august|september|october|november|december)\s+(?P<year>\d{4})"
+    r"|(?P<relative>this|last|previous)\s+month"
+)
+
+COMPARISON_PATTERN = re.compile(r"\bvs\b|\bversus\b|\bcompar|\bagainst\b")
+
+
+def _month_range(year: int, month: int) -> Tuple[date, date]:
+    return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+
+
 class RuleBasedQueryParser(BookingQueryParser):
 
+    def __init__(self, today: Callable[[], date] = date.today):
+        self.today = today
+
+    def _periods(self, q_lower: str, relative: bool) -> List[Tuple[date, date]]:
+        periods: List[Tuple[date, date]] = []
+
+        for match in PERIOD_PATTERN.finditer(q_lower):
+            # month + year - "november 2024"
+            if match.group("month"):
+                periods.append(_month_range(int(match.group("year")), MONTHS[match.group("month")]))
+                continue
+
+            if not relative:
+                continue
+
+            # relative month - "this month", "last month"
+            today = self.today()
+            year, month = today.year, today.month
+            if match.group("relative") != "this":
+                year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+            periods.append(_month_range(year, month))
+
+        return periods
+
     def parse_booking_query(self, query: str) -> ParsedQuery:
         q_lower = query.lower()
 
-        # month + year - "november 2024"
-        month_year = re.search(
-            r"(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{4})",
-            q_lower,
-        )
-        if not month_year:
+        # Relative months are only read as one side of a comparison; a
+        # single-period query still needs an explicit month and year.
+        comparison = COMPARISON_PATTERN.search(q_lower) is not None
+        periods = self._periods(q_lower, relative=comparison)
+        if not periods:
             raise ValueError("Could not parse query")
 
-        month_name = month_year.group(1)
-        year = int(month_year.group(2))
-        month = MONTHS[month_name]
-
-        start = date(year, month, 1)
-        end = date(year, month, monthrange(year, month)[1])
+        start, end = periods[0]
 
         q_upper = query.upper()
 
@@ -89,18 +127,42 @@ class RuleBasedQueryParser(BookingQueryParser):
                 query,
             )
 
-        return {
+        parsed: ParsedQuery = {
             "start_date": start.isoformat(),
             "end_date": end.isoformat(),
             "currency": currency,
         }
 
+        if len(periods) > 1 and comparison:
+            compare_start, compare_end = periods[1]
+            parsed["compare_start_date"] = compare_start.isoformat()
+            parsed["compare_end_date"] = compare_end.isoformat()
+
+        return parsed
+
 
 class OpenAIQueryParser(BookingQueryParser):
 
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(
+            self,
+            api_key: str,
+            model: str = "gpt-4o-mini",
+            client: OpenAI | None = None,
+            timeout: float = 30.0,
+    ):
+        self.api_key = api_key
         self.model = model
+        self._client = client
+        self.timeout = timeout
+
+    @property
+    def client(self) -> OpenAI:
+        # The OpenAI SDK is slow to import, so it is only loaded on first use.
+        if self._client is None:
+            from openai import OpenAI
+
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
 
     def parse_booking_query(self, query: str) -> ParsedQuery:
         tools = [
@@ -141,6 +203,24 @@ class OpenAIQueryParser(BookingQueryParser):
                                     "If not specified in the query, you may omit it."
                                 ),
                             },
+                            "compare_start_date": {
+                                "type": "string",
+                                "description": (
+                                    "Only for comparison queries such as "
+                                    "'November 2024 vs November 2023' or "
+                                    "'this month vs last month': start of the "
+                                    "second period, ISO format YYYY-MM-DD. "
+                                    "Omit it for single-period queries."
+                                ),
+                            },
+                            "compare_end_date": {
+                                "type": "string",
+                                "description": (
+                                    "Only for comparison queries: end of the "
+                                    "second period, ISO format YYYY-MM-DD. "
+                                    "Omit it for single-period queries."
+                                ),
+                            },
                         },
                         "required": ["start_date", "end_date"],
                     },
@@ -159,13 +239,21 @@ class OpenAIQueryParser(BookingQueryParser):
                     "you MUST call the function with start_date='UNSUPPORTED' "
                     "and end_date='UNSUPPORTED'. "
                     "NEVER invent or guess dates that are not explicitly present "
-                    "or clearly implied."
+                    "or clearly implied. "
+                    "If the user compares two periods, put the first period in "
+                    "start_date/end_date and the second in "
+                    "compare_start_date/compare_end_date. "
                     f"Today is {date.today().isoformat()}."
                 ),
             },
             {"role": "user", "content": query},
         ]
 
+        # Runs in a worker thread that cannot be cancelled, so bound the call
+        # itself by the request deadline.
+        deadline = current_deadline()
+        timeout = deadline.clamp(self.timeout) if deadline else self.timeout
+
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -176,8 +264,14 @@ class OpenAIQueryParser(BookingQueryParser):
                     "function": {"name": "extract_booking_filters"},
                 },
                 temperature=0,
+                timeout=timeout,
             )
         except Exception as e:
+            # A timeout caused by the request deadline must surface as such,
+            # not as a parse failure that the interpreter answers with the
+            # fallback parser after the budget is already spent.
+            if deadline is not None and deadline.remaining() <= 0:
+                raise DeadlineExceeded(f"Request deadline of {deadline.timeout:.1f}s exceeded") from e
             raise ValueError(f"OpenAI call failed: {e}") from e
 
         msg = response.choices[0].message
@@ -207,16 +301,41 @@ class OpenAIQueryParser(BookingQueryParser):
             else "EUR"
         )
 
-        return {
+        parsed: ParsedQuery = {
             "start_date": args["start_date"],
             "end_date": args["end_date"],
             "currency": currency,
         }
 
+        if args.get("compare_start_date") and args.get("compare_end_date"):
+            parsed["compare_start_date"] = args["compare_start_date"]
+            parsed["compare_end_date"] = args["compare_end_date"]
+
+        return parsed
+
+
+# Bump when the ParsedQuery shape or the prompt changes so entries cached by
+# an older version are not served.
+PARSER_CACHE_VERSION = 1
+
+
+class _FallbackAnswer(Exception):
+    """Carries a fallback parse out of ``get_or_compute`` without storing it."""
+
+    def __init__(self, parsed: ParsedQuery):
+        super().__init__()
+        self.parsed = parsed
+
 
 class BookingQueryInterpreter:
 
-    def __init__(self, primary: BookingQueryParser, fallback: BookingQueryParser | None = None):
+    def __init__(
+            self,
+            primary: BookingQueryParser,
+            fallback: BookingQueryParser | None = None,
+            cache: CacheBackend | None = None,
+            cache_ttl: float = 86400.0,
+    ):
         if isinstance(primary, RuleBasedQueryParser):
             self.primary = primary
             self.fallback = None
@@ -224,33 +343,77 @@ class BookingQueryInterpreter:
             self.primary = primary
             self.fallback = fallback or RuleBasedQueryParser()
 
-    def interpret(self, query: str) -> QueryFilters:
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+
+    def _parse(self, query: str) -> Tuple[ParsedQuery, bool]:
+        """Parse ``query``; the flag tells whether the fallback answered."""
         try:
-            parsed = self.primary.parse_booking_query(query)
+            return self.primary.parse_booking_query(query), False
+        except DeadlineExceeded:
+            raise
         except Exception:
             if self.fallback:
-                parsed = self.fallback.parse_booking_query(query)
-            else:
-                raise
+                return self.fallback.parse_booking_query(query), True
+            raise
+
+    async def _parse_cached(self, query: str) -> ParsedQuery:
+        # Parsers are synchronous (the OpenAI SDK call blocks), so they run in
+        # a worker thread to keep the event loop free.
+        if self.cache is None:
+            parsed, _ = await asyncio.to_thread(self._parse, query)
+            return parsed
+
+        # Relative phrases ("this month") depend on the current date, and
+        # answers differ between models of the same parser.
+        digest = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        parser = type(self.primary).__name__
+        model = getattr(self.primary, "model", "")
+        key = f"query:v{PARSER_CACHE_VERSION}:{parser}:{model}:{date.today().isoformat()}:{digest}"
+
+        async def compute() -> bytes:
+            parsed, from_fallback = await asyncio.to_thread(self._parse, query)
+            if from_fallback:
+                # The primary may have failed transiently (timeout, rate
+                # limit); don't pin the degraded answer in the shared cache.
+                raise _FallbackAnswer(parsed)
+            return json.dumps(parsed).encode("utf-8")
+
+        try:
+            return json.loads(await self.cache.get_or_compute(key, compute, self.cache_ttl))
+        except _FallbackAnswer as e:
+            return e.parsed
+
+    async def interpret(self, query: str) -> QueryFilters:
+        parsed = await self._parse_cached(query)
 
         try:
             start = date.fromisoformat(parsed["start_date"])
             end = date.fromisoformat(parsed["end_date"])
+
+            compare_start = compare_end = None
+            if parsed.get("compare_start_date") and parsed.get("compare_end_date"):
+                compare_start = date.fromisoformat(parsed["compare_start_date"])
+                compare_end = date.fromisoformat(parsed["compare_end_date"])
         except Exception as e:
             raise ValueError(f"Invalid dates from parser: {parsed}") from e
 
         currency = parsed.get("currency", "EUR").upper()
 
         logger.debug(
-            "Interpreted query %r -> start=%s, end=%s, currency=%s",
+            "Interpreted query %r -> start=%s, end=%s, currency=%s, compare=%s..%s",
             query,
             start,
             end,
             currency,
+            compare_start,
+            compare_end,
         )
 
         return QueryFilters(
             start_date=start,
             end_date=end,
             target_currency=currency,
+            compare_start_date=compare_start,
+            compare_end_date=compare_end,
         )
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Tuple
 
-from .models import Booking
+from .cache import CacheBackend
+from .models import Booking, BookingBatch
 from .turneo_client import TurneoClient
+from .turneo_schema import BookingRecord
 
 logger = logging.getLogger(__name__)
 
@@ -18,42 +21,91 @@ class BookingRepository(ABC):
 
 
 class TurneoBookingRepository(BookingRepository):
-    def __init__(self, client: TurneoClient):
+    def __init__(
+            self,
+            client: TurneoClient,
+            cache: CacheBackend | None = None,
+            cache_ttl: float = 300.0,
+            cache_namespace: str = "default",
+    ):
         self.client = client
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.cache_namespace = cache_namespace
 
-    async def get_bookings_between(self, start_date: date, end_date: date) -> Iterable[Booking]:
-        raw_list: List[dict] = await self.client.list_bookings(
+    async def get_bookings_between(self, start_date: date, end_date: date) -> BookingBatch:
+        if self.cache is None:
+            return await self._fetch_bookings(start_date, end_date)
+
+        async def compute() -> bytes:
+            batch = await self._fetch_bookings(start_date, end_date)
+            return batch.to_bytes()
+
+        data = await self.cache.get_or_compute(
+            self._cache_key(start_date, end_date), compute, self.cache_ttl
+        )
+        return BookingBatch.from_bytes(data)
+
+    async def refresh_bookings_between(self, start_date: date, end_date: date) -> BookingBatch:
+        # Fetches unconditionally and replaces the cached range, so readers
+        # keep hitting warm data while it is refreshed.
+        batch = await self._fetch_bookings(start_date, end_date)
+        if self.cache is not None:
+            await self.cache.set(self._cache_key(start_date, end_date), batch.to_bytes(), self.cache_ttl)
+        return batch
+
+    def _cache_key(self, start_date: date, end_date: date) -> str:
+        return f"bookings:{self.cache_namespace}:{start_date.isoformat()}:{end_date.isoformat()}"
+
+    async def _fetch_bookings(self, start_date: date, end_date: date) -> BookingBatch:
+        records: List[BookingRecord] = await self.client.list_booking_records(
             start_date=start_date,
             end_date=end_date,
         )
 
-        bookings: List[Booking] = []
+        bookings = BookingBatch()
+        skipped = 0
+        first_error: Exception | None = None
 
-        for item in raw_list:
+        for record in records:
             try:
-                local_time_str = item.get("localTime") or item.get("time")
+                local_time_str = record.local_time or record.time
                 if not local_time_str:
                     continue
 
                 date_str = local_time_str.split("T", 1)[0]
                 check_in = date.fromisoformat(date_str)
 
-                price = item.get("price", {}).get("finalRetailPrice", {})
-                amount = float(price.get("amount", 0.0))
-                currency = price.get("currency", "EUR")
+                # UNSET (no price given) books 0.00 EUR; an explicit null
+                # price is malformed.
+                price = record.price and record.price.final_retail_price
+                if price is None:
+                    raise ValueError("booking price is null")
+                amount = float(price.amount) if price else 0.0
+                currency = price.currency if price else "EUR"
 
                 bookings.append(
-                    Booking(
-                        id=str(item["id"]),
-                        check_in=check_in,
-                        currency=currency,
-                        amount=amount,
-                    )
+                    id=str(record.id),
+                    check_in=check_in,
+                    currency=currency,
+                    amount=amount,
                 )
             except Exception as e:
-                logger.warning("Skipping malformed booking item %r: %s", item, e)
+                # One summary line per fetch instead of one line per item: a
+                # bad page can hold thousands of them.
+                skipped += 1
+                first_error = first_error or e
                 continue
 
+        if skipped:
+            logger.warning(
+                "Skipped %d malformed booking items between %s and %s (first error: %s)",
+                skipped,
+                start_date,
+                end_date,
+                first_error,
+            )
+
         logger.info(
             "Mapped %d bookings from Turneo API between %s and %s",
             len(bookings),
@@ -61,3 +113,30 @@ class TurneoBookingRepository(BookingRepository):
             end_date,
         )
         return bookings
+
+
+class MultiAccountBookingRepository(BookingRepository):
+    """Queries several Turneo accounts concurrently and tags each booking with
+    its account. A per-account semaphore bounds in-flight fetches per account."""
+
+    def __init__(self, repos: Dict[str, TurneoBookingRepository], max_concurrency_per_account: int = 4):
+        self.repos = repos
+        self._limits = {name: asyncio.Semaphore(max_concurrency_per_account) for name in repos}
+
+    async def _fan_out(self, fetch) -> BookingBatch:
+        async def one(name: str, repo: TurneoBookingRepository) -> Tuple[str, BookingBatch]:
+            async with self._limits[name]:
+                return name, await fetch(repo)
+
+        results = await asyncio.gather(*(one(name, repo) for name, repo in self.repos.items()))
+
+        combined = BookingBatch()
+        for name, batch in results:
+            combined.extend(batch, account=name)
+        return combined
+
+    async def get_bookings_between(self, start_date: date, end_date: date) -> BookingBatch:
+        return await self._fan_out(lambda repo: repo.get_bookings_between(start_date, end_date))
+
+    async def refresh_bookings_between(self, start_date: date, end_date: date) -> BookingBatch:
+        return await self._fan_out(lambda repo: repo.refresh_bookings_between(start_date, end_date))
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import BaseModel
 
@@ -11,3 +11,8 @@ class QueryResponse(BaseModel):
     message: str
     total_value: Optional[float] = None
     currency: Optional[str] = None
+    per_account: Optional[Dict[str, float]] = None
+    # Only set for comparison queries ("November 2024 vs November 2023").
+    compare_total_value: Optional[float] = None
+    delta_value: Optional[float] = None
+    delta_percent: Optional[float] = None
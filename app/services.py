@@ -1,8 +1,11 @@
+import asyncio
 import logging
-from typing import Dict, Iterable, Tuple
+from datetime import date
+from typing import Dict, Iterable
 
 from .fx_client import FXRateProvider
-from .models import Booking, BookingSummary, QueryFilters
+from .models import (Booking, BookingBatch, BookingComparison, BookingSummary,
+                     QueryFilters)
 from .repositories import BookingRepository
 
 logger = logging.getLogger(__name__)
@@ -14,52 +17,97 @@ class BookingService:
         self.fx_client = fx_client
 
     async def summarize_bookings(self, filters: QueryFilters) -> BookingSummary:
-        bookings: Iterable[Booking] = await self.repo.get_bookings_between(
-            filters.start_date, filters.end_date
-        )
+        batch = await self._fetch(filters.start_date, filters.end_date)
 
-        booking_list = list(bookings)
-        logger.info(
-            "Total bookings retrieved between %s and %s: %d",
-            filters.start_date,
-            filters.end_date,
-            len(booking_list),
+        target = filters.target_currency.upper()
+        rates = await self._rates_to(target, batch.currencies)
+
+        return self._summarize(batch, target, rates)
+
+    async def compare_bookings(self, filters: QueryFilters) -> BookingComparison:
+        if not filters.is_comparison:
+            raise ValueError("Query does not describe two periods to compare.")
+
+        # Both periods are fetched concurrently and converted with one shared
+        # FX table, so each currency pair is looked up once.
+        current_batch, previous_batch = await asyncio.gather(
+            self._fetch(filters.start_date, filters.end_date),
+            self._fetch(filters.compare_start_date, filters.compare_end_date),
         )
 
         target = filters.target_currency.upper()
-        total = 0.0
+        currencies = dict.fromkeys(current_batch.currencies + previous_batch.currencies)
+        rates = await self._rates_to(target, currencies)
 
-        rate_cache: Dict[Tuple[str, str], float] = {}
+        current = self._summarize(current_batch, target, rates)
+        previous = self._summarize(previous_batch, target, rates)
+
+        delta = round(current.total_value - previous.total_value, 2)
+        delta_percent = (
+            round(delta / previous.total_value * 100, 2)
+            if previous.total_value
+            else None
+        )
 
-        for b in booking_list:
-            src = b.currency.upper()
+        return BookingComparison(
+            current=current,
+            previous=previous,
+            delta_value=delta,
+            delta_percent=delta_percent,
+        )
 
-            if src == target:
-                total += b.amount
-                continue
+    async def _fetch(self, start_date: date, end_date: date) -> BookingBatch:
+        bookings: Iterable[Booking] = await self.repo.get_bookings_between(start_date, end_date)
 
-            key = (src, target)
-            rate = rate_cache.get(key)
+        batch = BookingBatch.from_bookings(bookings)
+        logger.info(
+            "Total bookings retrieved between %s and %s: %d",
+            start_date,
+            end_date,
+            len(batch),
+        )
+        return batch
 
-            if rate is None:
-                try:
-                    rate = await self.fx_client.get_rate(src, target)
-                except ValueError as e:
-                    logger.error(
-                        "Could not convert from %s to %s: %s",
-                        src,
-                        target,
-                        e,
-                    )
-                    raise ValueError(f"Could not convert from {src} to {target}: {e}") from e
+    @staticmethod
+    def _summarize(batch: BookingBatch, target: str, rates: Dict[str, float]) -> BookingSummary:
+        totals = batch.totals_by_account_currency()
 
-                rate_cache[key] = rate
-                logger.debug(f"Fetched FX rate {src}->{target} = {rate}")
+        per_account: Dict[str | None, float] = {
+            account: sum(amount * rates[src] for src, amount in by_currency.items())
+            for account, by_currency in totals.items()
+        }
+        total = sum(per_account.values())
 
-            converted = b.amount * rate
-            total += converted
+        # Only multi-account repositories tag bookings with an account; an
+        # account without bookings in the range still reports 0.
+        tagged = {account: round(per_account.get(account, 0.0), 2) for account in batch.accounts}
 
         return BookingSummary(
             total_value=round(total, 2),
             currency=target,
+            per_account=tagged or None,
         )
+
+    async def _rates_to(self, target: str, currencies: Iterable[str]) -> Dict[str, float]:
+        sources = [src for src in currencies if src != target]
+
+        async def fetch(src: str) -> float:
+            try:
+                rate = await self.fx_client.get_rate(src, target)
+            except ValueError as e:
+                logger.error(
+                    "Could not convert from %s to %s: %s",
+                    src,
+                    target,
+                    e,
+                )
+                raise ValueError(f"Could not convert from {src} to {target}: {e}") from e
+
+            logger.debug("Fetched FX rate %s->%s = %s", src, target, rate)
+            return rate
+
+        fetched = await asyncio.gather(*(fetch(src) for src in sources))
+
+        rates = dict(zip(sources, fetched))
+        rates[target] = 1.0
+        return rates
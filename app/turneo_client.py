@@ -1,17 +1,53 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from datetime import date
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Tuple
 
 import httpx
 
-from .config import settings
+from .cache import CacheBackend
+from .hedging import RequestHedger
+from .http_cache import ConditionalFetcher
+from .turneo_schema import BookingRecord, decode_booking_page
+
+PageDecoder = Callable[[bytes], Tuple[List[Any], str | None]]
+
+
+def _decode_raw_page(content: bytes) -> Tuple[List[Dict[str, Any]], str | None]:
+    data = json.loads(content)
+
+    results = data.get("results", [])
+    if not isinstance(results, list):
+        results = []
+
+    return results, data.get("next") or None
+
+
+def _decode_record_page(content: bytes) -> Tuple[List[BookingRecord], str | None]:
+    page = decode_booking_page(content)
+    return page.results, page.next or None
 
 
 class TurneoClient:
-    def __init__(self):
-        self.base_url = settings.turneo_api_root.rstrip("/")
-        self.api_key = settings.turneo_api_key
+    def __init__(
+            self,
+            base_url: str,
+            api_key: str,
+            cache: CacheBackend | None = None,
+            validator_ttl: float | None = None,
+            hedger: RequestHedger | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self._fetcher = ConditionalFetcher(
+            "turneo",
+            cache=cache,
+            ttl=validator_ttl,
+            namespace=hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16],
+            hedger=hedger,
+        )
 
     def _headers(self) -> Dict[str, str]:
         return {
@@ -24,6 +60,21 @@ class TurneoClient:
             start_date: date | None = None,
             end_date: date | None = None,
     ) -> List[Dict[str, Any]]:
+        return await self._paginate(start_date, end_date, _decode_raw_page)
+
+    async def list_booking_records(
+            self,
+            start_date: date | None = None,
+            end_date: date | None = None,
+    ) -> List[BookingRecord]:
+        return await self._paginate(start_date, end_date, _decode_record_page)
+
+    async def _paginate(
+            self,
+            start_date: date | None,
+            end_date: date | None,
+            decode: PageDecoder,
+    ) -> List[Any]:
         params: Dict[str, Any] = {}
 
         if start_date:
@@ -31,7 +82,7 @@ class TurneoClient:
         if end_date:
             params["startTime[lte]"] = end_date.isoformat()
 
-        all_results: List[Dict[str, Any]] = []
+        all_results: List[Any] = []
 
         url = f"{self.base_url}/bookings"
 
@@ -40,12 +91,12 @@ class TurneoClient:
 
             while url:
                 try:
-                    resp = await client.get(
+                    content = await self._fetcher.get(
+                        client,
                         url,
                         headers=self._headers(),
                         params=params if first_request else None,
                     )
-                    resp.raise_for_status()
                 except httpx.RequestError as e:
                     raise RuntimeError(f"Failed to contact Turneo API: {e}") from e
                 except httpx.HTTPStatusError as e:
@@ -54,13 +105,12 @@ class TurneoClient:
                         f"{e.response.status_code}: {e.response.text}"
                     ) from e
 
-                data = resp.json()
-
-                results = data.get("results", [])
-                if isinstance(results, list):
-                    all_results.extend(results)
+                try:
+                    results, url = decode(content)
+                except (ValueError, AttributeError) as e:
+                    raise RuntimeError(f"Turneo API returned an invalid page: {e}") from e
 
-                url = data.get("next") or None
+                all_results.extend(results)
                 first_request = False
 
         return all_results
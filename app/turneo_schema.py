@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+from typing import List
+
+import msgspec
+from msgspec import UNSET, UnsetType
+
+logger = logging.getLogger(__name__)
+
+
+# Only the fields TurneoBookingRepository reads are declared; msgspec skips
+# everything else in the payload without building Python objects for it.
+
+class Money(msgspec.Struct):
+    amount: float | str = 0.0
+    currency: str = "EUR"
+
+
+# A missing price means 0.00 EUR, but an explicit ``null`` marks a malformed
+# item, so the two are kept apart with UNSET.
+
+class Price(msgspec.Struct):
+    final_retail_price: Money | None | UnsetType = msgspec.field(default=UNSET, name="finalRetailPrice")
+
+
+class BookingRecord(msgspec.Struct):
+    id: str | int
+    local_time: str | None = msgspec.field(default=None, name="localTime")
+    time: str | None = None
+    price: Price | None | UnsetType = UNSET
+
+
+class BookingPage(msgspec.Struct):
+    results: List[BookingRecord] | None = None
+    next: str | None = None
+
+
+class _RawBookingPage(msgspec.Struct):
+    results: msgspec.Raw = msgspec.Raw()
+    next: str | None = None
+
+
+_page_decoder = msgspec.json.Decoder(BookingPage)
+_raw_page_decoder = msgspec.json.Decoder(_RawBookingPage)
+_raw_list_decoder = msgspec.json.Decoder(List[msgspec.Raw])
+_record_decoder = msgspec.json.Decoder(BookingRecord)
+
+
+def decode_booking_page(content: bytes) -> BookingPage:
+    try:
+        page = _page_decoder.decode(content)
+        if page.results is None:
+            page.results = []
+        return page
+    except msgspec.ValidationError:
+        pass
+
+    # At least one item does not match the schema: decode items one by one
+    # so a single bad booking does not discard the whole page.
+    raw_page = _raw_page_decoder.decode(content)
+    try:
+        # ``results`` that is not a list is treated as an empty page.
+        raw_items = _raw_list_decoder.decode(raw_page.results) if raw_page.results else []
+    except msgspec.ValidationError:
+        raw_items = []
+
+    records: List[BookingRecord] = []
+    skipped = 0
+    first_error: Exception | None = None
+
+    for raw in raw_items:
+        try:
+            records.append(_record_decoder.decode(raw))
+        except msgspec.ValidationError as e:
+            skipped += 1
+            first_error = first_error or e
+
+    if skipped:
+        logger.warning(
+            "Skipping %d malformed booking items in Turneo page (first error: %s)",
+            skipped,
+            first_error,
+        )
+
+    return BookingPage(results=records, next=raw_page.next)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from calendar import monthrange
+from datetime import date
+from typing import Awaitable, Callable, List, Sequence, Tuple
+
+from .cache import CacheBackend
+from .fx_client import FXClient
+from .repositories import (MultiAccountBookingRepository,
+                           TurneoBookingRepository)
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_period(name: str, today: date | None = None) -> Tuple[date, date]:
+    """Turn "this_month", "last_month" or "YYYY-MM" into a full-month range."""
+    today = today or date.today()
+
+    if name == "this_month":
+        year, month = today.year, today.month
+    elif name == "last_month":
+        year, month = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+    else:
+        try:
+            year, month = (int(part) for part in name.split("-"))
+            date(year, month, 1)
+        except ValueError as e:
+            raise ValueError(f"Unsupported warm-up period: {name!r}") from e
+
+    return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+
+
+class CacheWarmer:
+    """Periodically refreshes hot booking ranges and FX tables in the cache.
+
+    A cycle runs its jobs under a concurrency budget and is abandoned on the
+    first upstream error. Retries back off exponentially from ``retry_delay``
+    but never wait longer than ``ttl - jitter``, so warmed entries are
+    retried before they expire while upstream is flaky. When the cache is
+    shared, only one worker runs each cycle.
+    """
+
+    def __init__(
+            self,
+            repo: TurneoBookingRepository | MultiAccountBookingRepository,
+            fx_client: FXClient,
+            cache: CacheBackend,
+            periods: Sequence[str],
+            currencies: Sequence[str],
+            interval: float = 240.0,
+            jitter: float = 30.0,
+            concurrency: int = 2,
+            max_backoff: float = 1800.0,
+            retry_delay: float = 5.0,
+            ttl: float | None = None,
+    ):
+        self.repo = repo
+        self.fx_client = fx_client
+        self.cache = cache
+        self.periods = list(periods)
+        self.currencies = [c.upper() for c in currencies]
+        self.interval = interval
+        self.jitter = jitter
+        self.concurrency = concurrency
+        self.max_backoff = max_backoff
+        self.retry_delay = retry_delay
+        self.ttl = ttl
+        self._task: asyncio.Task | None = None
+
+    def _jobs(self) -> List[Callable[[], Awaitable[object]]]:
+        jobs: List[Callable[[], Awaitable[object]]] = []
+
+        for period in self.periods:
+            start, end = resolve_period(period)
+            jobs.append(lambda s=start, e=end: self.repo.refresh_bookings_between(s, e))
+
+        if self.fx_client.is_configured():
+            for base in self.currencies:
+                jobs.append(lambda b=base: self.fx_client.refresh_rates(b, self.currencies))
+
+        return jobs
+
+    async def warm_once(self) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(job: Callable[[], Awaitable[object]]) -> None:
+            async with semaphore:
+                await job()
+
+        # TaskGroup cancels the remaining jobs as soon as one of them fails.
+        async with asyncio.TaskGroup() as tg:
+            for job in self._jobs():
+                tg.create_task(run(job))
+
+    async def _warm_cycle(self) -> None:
+        slot = int(time.time() // self.interval)
+
+        async def cycle() -> bytes:
+            started = time.perf_counter()
+            await self.warm_once()
+            logger.info("Cache warm-up finished in %.2fs", time.perf_counter() - started)
+            return b"1"
+
+        # Workers sharing the cache agree on one warm-up per interval slot.
+        await self.cache.get_or_compute(f"warmer:{slot}", cycle, self.interval * 2)
+
+    def _backoff(self, failures: int) -> float:
+        delay = min(self.retry_delay * 2 ** (failures - 1), self.max_backoff)
+        if self.ttl is not None:
+            delay = min(delay, max(self.ttl - self.jitter, self.retry_delay))
+        return delay
+
+    async def _run(self) -> None:
+        failures = 0
+        delay = random.uniform(0, self.jitter)
+
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._warm_cycle()
+                failures = 0
+                delay = self.interval
+            except Exception as e:
+                if isinstance(e, ExceptionGroup):
+                    e = e.exceptions[0]
+                failures += 1
+                delay = self._backoff(failures)
+                logger.warning(
+                    "Cache warm-up stopped after an upstream error, retrying in %.0fs: %s",
+                    delay,
+                    e,
+                )
+            delay += random.uniform(0, self.jitter)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,93 @@
+import argparse
+import gc
+import random
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, List
+
+from app.models import Booking, BookingBatch
+
+
+@dataclass
+class LegacyBooking:
+    # The pre-BookingBatch representation: a plain dataclass with a __dict__.
+    id: str
+    check_in: date
+    currency: str
+    amount: float
+
+
+def generate_rows(n: int, seed: int = 42) -> List[tuple]:
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    currencies = ["EUR", "USD", "GBP", "CHF"]
+
+    return [
+        (
+            rng.getrandbits(64),
+            start + timedelta(days=rng.randrange(365)),
+            rng.choice(currencies),
+            round(rng.uniform(10, 2_000), 2),
+        )
+        for _ in range(n)
+    ]
+
+
+def measure(build: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory footprint of booking representations")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # Keep the source rows raw so every representation has to allocate its
+    # own ids, dates and currency codes, as the repository does.
+    rows = [
+        (id_, d.isoformat(), cur.lower(), amount)
+        for id_, d, cur, amount in generate_rows(args.rows)
+    ]
+
+    def legacy() -> object:
+        return [
+            LegacyBooking(id=f"bk_{id_:016x}", check_in=date.fromisoformat(d), currency=cur.upper(), amount=a)
+            for id_, d, cur, a in rows
+        ]
+
+    def slotted() -> object:
+        return [
+            Booking(id=f"bk_{id_:016x}", check_in=date.fromisoformat(d), currency=cur.upper(), amount=a)
+            for id_, d, cur, a in rows
+        ]
+
+    def batch() -> object:
+        b = BookingBatch()
+        for id_, d, cur, a in rows:
+            b.append(f"bk_{id_:016x}", date.fromisoformat(d), cur, a)
+        return b
+
+    results = [
+        ("list[dataclass Booking] (legacy)", measure(legacy)),
+        ("list[slotted Booking]", measure(slotted)),
+        ("BookingBatch", measure(batch)),
+    ]
+
+    baseline = results[0][1]
+    print(f"\n=== Booking memory benchmark ({args.rows:,} rows) ===")
+    for name, size in results:
+        print(
+            f"{name:<34} {size / 1024 / 1024:8.2f} MiB  "
+            f"{size / args.rows:7.1f} B/row  {size / baseline:6.1%} of legacy"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in a fresh interpreter so nothing is already imported or cached.
+# The query is deliberately unparseable: it exercises app construction and
+# the parser without touching the network.
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+from app.main import app
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    t2 = time.perf_counter()
+    resp = client.post("/query", json={"query": "cold start probe"})
+    t3 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "startup_ms": (t2 - t1) * 1000,
+    "first_response_ms": (t3 - t2) * 1000,
+    "status": resp.status_code,
+}))
+"""
+
+
+def run_probe(env: Dict[str, str]) -> Dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold start: import time and time to first response")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=1000.0)
+    parser.add_argument("--ttfr-budget-ms", type=float, default=2000.0)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["TURNEO_API_KEY"] = env.get("TURNEO_API_KEY") or "bench"
+    env["OPENAI_API_KEY"] = ""
+
+    samples: List[Dict[str, float]] = [run_probe(env) for _ in range(args.runs)]
+
+    def median(field: str) -> float:
+        return statistics.median(s[field] for s in samples)
+
+    import_ms = median("import_ms")
+    ttfr_ms = import_ms + median("startup_ms") + median("first_response_ms")
+
+    print(f"\n=== Cold start ({args.runs} runs, median) ===")
+    print(f"import app.main        {import_ms:8.1f} ms  (budget {args.import_budget_ms:.0f} ms)")
+    print(f"lifespan startup       {median('startup_ms'):8.1f} ms")
+    print(f"first /query response  {median('first_response_ms'):8.1f} ms")
+    print(f"time to first response {ttfr_ms:8.1f} ms  (budget {args.ttfr_budget_ms:.0f} ms)")
+
+    if import_ms > args.import_budget_ms or ttfr_ms > args.ttfr_budget_ms:
+        print("Cold start budget exceeded.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
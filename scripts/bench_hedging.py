@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import List
+
+import httpx
+
+from app.hedging import RequestHedger
+from app.http_cache import ConditionalFetcher
+from app.metrics import metrics, percentile
+
+PAGE = json.dumps({"results": [], "next": None}).encode()
+
+
+def make_transport(rng: random.Random, base: float, straggler: float, straggler_rate: float) -> httpx.MockTransport:
+    # Most pages answer in ~base seconds; a few straggle for ~straggler seconds.
+    async def handler(request: httpx.Request) -> httpx.Response:
+        slow = rng.random() < straggler_rate
+        await asyncio.sleep((straggler if slow else base) * rng.uniform(0.8, 1.2))
+        return httpx.Response(200, content=PAGE)
+
+    return httpx.MockTransport(handler)
+
+
+async def run(fetcher: ConditionalFetcher, transport: httpx.MockTransport, pages: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        async def one() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                await fetcher.get(client, "https://api.example.com/bookings")
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(one() for _ in range(pages)))
+
+    return latencies
+
+
+def report(name: str, latencies: List[float]) -> None:
+    p50, p95, p99 = (percentile(latencies, p) * 1000 for p in (50, 95, 99))
+    print(f"{name:<12} {p50:8.1f} {p95:8.1f} {p99:8.1f}")
+
+
+async def bench(args: argparse.Namespace) -> None:
+    baseline = await run(
+        ConditionalFetcher("turneo"),
+        make_transport(random.Random(args.seed), args.base, args.straggler, args.straggler_rate),
+        args.pages,
+        args.concurrency,
+    )
+
+    metrics.reset()
+    hedger = RequestHedger("turneo", pct=args.percentile, budget_ratio=args.budget)
+    hedged = await run(
+        ConditionalFetcher("turneo", hedger=hedger),
+        make_transport(random.Random(args.seed), args.base, args.straggler, args.straggler_rate),
+        args.pages,
+        args.concurrency,
+    )
+    labels = {"upstream": "turneo", "endpoint": "api.example.com/bookings"}
+    hedges = metrics.counter("upstream_hedges_total", **labels)
+    wins = metrics.counter("upstream_hedge_wins_total", **labels)
+
+    print(f"\n=== Turneo page latency, {args.pages} pages, {args.straggler_rate:.0%} stragglers ===")
+    print(f"{'':<12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    report("no hedging", baseline)
+    report("hedged", hedged)
+    print(
+        f"hedge rate {hedges / args.pages:.1%} (budget {args.budget:.0%}), "
+        f"hedge wins {wins:.0f}/{hedges:.0f}, "
+        f"p99 {percentile(baseline, 99) / percentile(hedged, 99):.1f}x lower"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Turneo page tail latency with and without hedging")
+    parser.add_argument("--pages", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--base", type=float, default=0.02, help="typical page latency in seconds")
+    parser.add_argument("--straggler", type=float, default=0.5, help="straggler page latency in seconds")
+    parser.add_argument("--straggler-rate", type=float, default=0.02)
+    parser.add_argument("--percentile", type=float, default=95.0)
+    parser.add_argument("--budget", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
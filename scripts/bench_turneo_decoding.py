@@ -0,0 +1,123 @@
+import argparse
+import json
+import random
+import time
+from datetime import date
+from typing import Callable, List
+
+from app.models import BookingBatch
+from app.turneo_schema import decode_booking_page
+
+
+def generate_page(n: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    currencies = ["EUR", "USD", "GBP", "CHF"]
+
+    def money() -> dict:
+        return {"amount": round(rng.uniform(10, 2_000), 2), "currency": rng.choice(currencies)}
+
+    results = []
+    for i in range(n):
+        day = rng.randrange(1, 29)
+        results.append(
+            {
+                "id": f"bk_{i:08d}",
+                "status": "confirmed",
+                "createdAt": f"2024-10-{day:02d}T08:15:00Z",
+                "time": f"2024-11-{day:02d}T09:00:00Z",
+                "localTime": f"2024-11-{day:02d}T10:00:00",
+                "customer": {
+                    "firstName": "Jane",
+                    "lastName": "Doe",
+                    "emails": ["jane@example.com"],
+                    "phone": "+385 1 234 5678",
+                    "address": {"city": "Zagreb", "country": "HR", "zip": "10000"},
+                },
+                "experience": {
+                    "id": f"exp_{rng.randrange(500)}",
+                    "name": "Old town walking tour",
+                    "description": "A long marketing description " * 8,
+                    "images": [f"https://cdn.example.com/{j}.jpg" for j in range(6)],
+                },
+                "rates": [
+                    {"name": "Adult", "quantity": 2, "price": money()},
+                    {"name": "Child", "quantity": 1, "price": money()},
+                ],
+                "price": {
+                    "finalRetailPrice": money(),
+                    "netPrice": money(),
+                    "commission": money(),
+                    "taxes": [money(), money()],
+                },
+            }
+        )
+
+    return json.dumps({"results": results, "next": None}).encode()
+
+
+def legacy_path(content: bytes) -> BookingBatch:
+    # resp.json() followed by the old per-item dict walking in the repository.
+    data = json.loads(content)
+    batch = BookingBatch()
+    for item in data.get("results", []):
+        try:
+            local_time_str = item.get("localTime") or item.get("time")
+            if not local_time_str:
+                continue
+            check_in = date.fromisoformat(local_time_str.split("T", 1)[0])
+            price = item.get("price", {}).get("finalRetailPrice", {})
+            batch.append(
+                str(item["id"]),
+                check_in,
+                price.get("currency", "EUR"),
+                float(price.get("amount", 0.0)),
+            )
+        except Exception:
+            continue
+    return batch
+
+
+def schema_path(content: bytes) -> BookingBatch:
+    batch = BookingBatch()
+    for record in decode_booking_page(content).results:
+        local_time_str = record.local_time or record.time
+        if not local_time_str:
+            continue
+        price = record.price.final_retail_price if record.price else None
+        batch.append(
+            str(record.id),
+            date.fromisoformat(local_time_str.split("T", 1)[0]),
+            price.currency if price else "EUR",
+            float(price.amount) if price else 0.0,
+        )
+    return batch
+
+
+def best_of(fn: Callable[[bytes], BookingBatch], content: bytes, repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(content)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Turneo page decoding: json+dicts vs. msgspec schema")
+    parser.add_argument("--items", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = generate_page(args.items)
+    assert legacy_path(content).totals_by_currency() == schema_path(content).totals_by_currency()
+
+    legacy = best_of(legacy_path, content, args.repeat)
+    schema = best_of(schema_path, content, args.repeat)
+
+    print(f"\n=== Turneo page decoding ({args.items:,} items, {len(content) / 1024 / 1024:.1f} MiB) ===")
+    print(f"json.loads + dict walk   {legacy * 1000:8.1f} ms")
+    print(f"msgspec schema decode    {schema * 1000:8.1f} ms  ({legacy / schema:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
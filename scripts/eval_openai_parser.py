@@ -1,120 +1,352 @@
+"""Evaluate booking query parsers against a labeled dataset.
+
+Runs the OpenAI, rule-based and router (OpenAI with rule-based fallback)
+parsers concurrently over an NDJSON dataset. LLM responses are recorded to a
+cassette file, so later runs replay them offline instead of calling the API.
+
+    python -m scripts.eval_openai_parser --parser openai rule router
+    python -m scripts.eval_openai_parser --record none   # offline replay only
+"""
+
+import argparse
 import asyncio
+import hashlib
 import json
-from typing import Any, Dict, List
-
-from app.config import settings
-from app.query_parser import OpenAIQueryParser
-
-EVAL_DATASET: List[Dict[str, Any]] = [
-    {
-        "query": "Show me all the bookings you have in USD",
-        "expected": {
-            "expect_error": True,
-            "currency": "USD",
-        },
-    },
-    {
-        "query": "Show me bookings in November 2024 in USD",
-        "expected": {
-            "start_date": "2024-11-01",
-            "end_date": "2024-11-30",
-            "currency": "USD",
-        },
-    },
-    {
-        "query": "Prikaži rezervacije za ožujak 2023 u eurima",
-        "expected": {
-            "start_date": "2023-03-01",
-            "end_date": "2023-03-31",
-            "currency": "EUR",
-        },
-    },
-    {
-        "query": "bookings 2024-11-10 to 2024-11-20",
-        "expected": {
-            "start_date": "2024-11-10",
-            "end_date": "2024-11-20",
-            "currency": "EUR",
-        },
-    },
-]
-
-
-async def evaluate():
-    parser = OpenAIQueryParser(api_key=settings.openai_api_key)
-
-    total = len(EVAL_DATASET)
-    passed = 0
-    results = []
-
-    for item in EVAL_DATASET:
-        query = item["query"]
-        expected = item["expected"]
-        expect_error = expected.get("expect_error", False)
-
-        try:
-            parsed = parser.parse_booking_query(query)
-
-            if expect_error:
-                results.append(
-                    {
-                        "query": query,
-                        "parsed": parsed,
-                        "expected": expected,
-                        "status": "MISMATCH_EXPECTED_ERROR",
-                    }
-                )
-                continue
-
-            success = (
-                    parsed["start_date"] == expected["start_date"]
-                    and parsed["end_date"] == expected["end_date"]
-                    and parsed["currency"].upper() == expected["currency"].upper()
-            )
-
-            if success:
-                passed += 1
-
-            results.append(
-                {
-                    "query": query,
-                    "parsed": parsed,
-                    "expected": expected,
-                    "status": "OK" if success else "MISMATCH",
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List
+
+from openai.types.chat import ChatCompletion
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from app.query_parser import (BookingQueryInterpreter, OpenAIQueryParser,
+                              ParsedQuery, RuleBasedQueryParser)
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_DATASET = SCRIPTS_DIR / "eval_dataset.jsonl"
+DEFAULT_CASSETTE = SCRIPTS_DIR / "eval_cassette.json"
+
+# USD per 1M tokens (gpt-4o-mini list prices).
+DEFAULT_INPUT_PRICE = 0.15
+DEFAULT_OUTPUT_PRICE = 0.60
+
+
+class OpenAISettings(BaseSettings):
+    """Only the OpenAI part of app.config.Settings, which would otherwise
+    require Turneo credentials the harness never uses."""
+
+    openai_api_key: str | None = None
+    openai_model: str = "gpt-4o-mini"
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class CassetteMiss(RuntimeError):
+    pass
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across threads."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        time.sleep(max(0.0, slot - now))
+
+
+class Cassette:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            self.entries = json.loads(path.read_text(encoding="utf-8"))
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        with self._lock:
+            return self.entries.get(key)
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.entries[key] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.write_text(
+            json.dumps(self.entries, indent=1, sort_keys=True, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+
+@dataclass
+class LLMStats:
+    calls: int = 0
+    live_calls: int = 0
+    misses: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    recorded_latencies: List[float] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class RecordingOpenAI:
+    """Drop-in for ``openai.OpenAI`` inside OpenAIQueryParser that serves
+    chat completions from a cassette and records misses when allowed."""
+
+    def __init__(self, cassette: Cassette, mode: str, api_key: str | None, limiter: RateLimiter) -> None:
+        self.cassette = cassette
+        self.mode = mode
+        self.api_key = api_key
+        self.limiter = limiter
+        self.stats = LLMStats()
+        self._client = None
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    @staticmethod
+    def _key(kwargs: Dict[str, Any]) -> str:
+        # The system prompt embeds today's date; keying on it would expire the
+        # cassette daily, so only the model, tools and user message count.
+        user_messages = [m["content"] for m in kwargs["messages"] if m["role"] == "user"]
+        material = json.dumps(
+            {"model": kwargs["model"], "tools": kwargs.get("tools"), "user": user_messages},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _live_client(self):
+        if self._client is None:
+            from openai import OpenAI
+
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
+
+    def _create(self, **kwargs: Any) -> ChatCompletion:
+        key = self._key(kwargs)
+        entry = None if self.mode == "all" else self.cassette.get(key)
+        live = entry is None
+
+        if live:
+            if self.mode == "none" or not self.api_key:
+                with self.stats.lock:
+                    self.stats.misses += 1
+                raise CassetteMiss(f"No cassette entry for query {kwargs['messages'][-1]['content']!r}")
+
+            self.limiter.acquire()
+            start = time.perf_counter()
+            response = self._live_client().chat.completions.create(**kwargs)
+            entry = {
+                "query": kwargs["messages"][-1]["content"],
+                "latency_ms": (time.perf_counter() - start) * 1000,
+                "response": response.model_dump(mode="json"),
+            }
+            self.cassette.put(key, entry)
+
+        usage = entry["response"].get("usage") or {}
+        with self.stats.lock:
+            self.stats.calls += 1
+            self.stats.live_calls += int(live)
+            self.stats.prompt_tokens += usage.get("prompt_tokens", 0)
+            self.stats.completion_tokens += usage.get("completion_tokens", 0)
+            self.stats.recorded_latencies.append(entry["latency_ms"])
+
+        return ChatCompletion.model_validate(entry["response"])
+
+
+@dataclass
+class ParserRun:
+    name: str
+    parse: Callable[[str], Awaitable[ParsedQuery]]
+    llm: RecordingOpenAI | None = None
+    latencies: List[float] = field(default_factory=list)
+    results: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def build_runs(names: List[str], cassette: Cassette, mode: str, limiter: RateLimiter) -> List[ParserRun]:
+    settings: OpenAISettings | None = None
+    runs: List[ParserRun] = []
+
+    for name in names:
+        if name == "rule":
+            parser = RuleBasedQueryParser()
+            runs.append(ParserRun(name, lambda q, p=parser: asyncio.to_thread(p.parse_booking_query, q)))
+            continue
+
+        settings = settings or OpenAISettings()
+        llm = RecordingOpenAI(cassette, mode, settings.openai_api_key, limiter)
+        parser = OpenAIQueryParser(
+            api_key=settings.openai_api_key or "replay",
+            model=settings.openai_model,
+            client=llm,
+        )
+
+        if name == "openai":
+            runs.append(ParserRun(name, lambda q, p=parser: asyncio.to_thread(p.parse_booking_query, q), llm))
+        elif name == "router":
+            interpreter = BookingQueryInterpreter(parser)
+
+            async def route(q: str, i: BookingQueryInterpreter = interpreter) -> ParsedQuery:
+                filters = await i.interpret(q)
+                return {
+                    "start_date": filters.start_date.isoformat(),
+                    "end_date": filters.end_date.isoformat(),
+                    "currency": filters.target_currency,
                 }
-            )
-
-        except Exception as e:
-            if expect_error:
-                # Očekivana greška → treat as pass
-                passed += 1
-                results.append(
-                    {
-                        "query": query,
-                        "status": "OK_ERROR",
-                        "error": str(e),
-                    }
-                )
-            else:
-                results.append(
-                    {
-                        "query": query,
-                        "status": "ERROR",
-                        "error": str(e),
-                    }
-                )
-
-    # ==== Summary ====
-    for res in results:
-        print(json.dumps(res, indent=2, ensure_ascii=False))
+
+            runs.append(ParserRun(name, route, llm))
+        else:
+            raise SystemExit(f"Unknown parser: {name}")
+
+    return runs
+
+
+def score(expected: Dict[str, Any], parsed: ParsedQuery | None, error: Exception | None) -> str:
+    if expected.get("expect_error", False):
+        return "OK_ERROR" if error is not None else "MISMATCH_EXPECTED_ERROR"
+    if error is not None:
+        return "ERROR"
+
+    success = (
+            parsed["start_date"] == expected["start_date"]
+            and parsed["end_date"] == expected["end_date"]
+            and parsed.get("currency", "EUR").upper() == expected["currency"].upper()
+    )
+    return "OK" if success else "MISMATCH"
+
+
+async def evaluate_run(run: ParserRun, dataset: List[Dict[str, Any]], concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(item: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            parsed, error = None, None
+            start = time.perf_counter()
+            try:
+                parsed = await run.parse(item["query"])
+            except Exception as e:
+                error = e
+            run.latencies.append((time.perf_counter() - start) * 1000)
+
+        result = {"query": item["query"], "status": score(item["expected"], parsed, error)}
+        if parsed is not None:
+            result["parsed"] = parsed
+        if error is not None:
+            result["error"] = str(error)
+        result["expected"] = item["expected"]
+        return result
+
+    run.results = await asyncio.gather(*(one(item) for item in dataset))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def load_dataset(path: Path) -> List[Dict[str, Any]]:
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def report(runs: List[ParserRun], input_price: float, output_price: float, verbose: bool) -> None:
+    if verbose:
+        for run in runs:
+            for res in run.results:
+                if res["status"] not in ("OK", "OK_ERROR"):
+                    print(json.dumps({"parser": run.name, **res}, ensure_ascii=False))
         print()
 
-    print("\n=== OpenAI Parser Evaluation ===")
-    print(f"Total queries:    {total}")
-    print(f"Correct outputs:  {passed}")
-    print(f"Accuracy:         {passed / total * 100:.1f}%")
-    print("--------------------------------------\n")
+    print("=== Parser Evaluation ===")
+    print(
+        f"{'parser':<8} {'total':>6} {'correct':>8} {'accuracy':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'llm p95':>8} "
+        f"{'calls':>6} {'live':>5} {'cost USD':>9}"
+    )
+    for run in runs:
+        total = len(run.results)
+        passed = sum(r["status"] in ("OK", "OK_ERROR") for r in run.results)
+
+        llm_p95, calls, live, cost = 0.0, 0, 0, 0.0
+        if run.llm is not None:
+            stats = run.llm.stats
+            llm_p95 = percentile(stats.recorded_latencies, 95)
+            calls, live = stats.calls, stats.live_calls
+            cost = (stats.prompt_tokens * input_price + stats.completion_tokens * output_price) / 1_000_000
+
+        print(
+            f"{run.name:<8} {total:>6} {passed:>8} {passed / total * 100 if total else 0:>8.1f}% "
+            f"{percentile(run.latencies, 50):>8.1f} {percentile(run.latencies, 95):>8.1f} "
+            f"{percentile(run.latencies, 99):>8.1f} {llm_p95:>8.1f} "
+            f"{calls:>6} {live:>5} {cost:>9.5f}"
+        )
+    print("-------------------------")
+    print("'llm p95' is the upstream latency recorded in the cassette; cost covers all LLM calls, replayed or live.")
+
+
+async def evaluate(args: argparse.Namespace) -> None:
+    dataset = load_dataset(args.dataset)
+    cassette = Cassette(args.cassette)
+    limiter = RateLimiter(args.rate_limit)
+    runs = build_runs(args.parser, cassette, args.record, limiter)
+
+    try:
+        for run in runs:
+            await evaluate_run(run, dataset, args.concurrency)
+    finally:
+        cassette.save()
+
+    # Parsers wrap LLM failures (and the router falls back), so offline
+    # cassette misses are detected from the counters rather than exceptions.
+    misses = sum(run.llm.stats.misses for run in runs if run.llm is not None)
+    if misses:
+        sys.exit(
+            f"{misses} LLM calls had no cassette entry; set OPENAI_API_KEY and "
+            "re-run with --record new to record them."
+        )
+
+    report(runs, args.input_price, args.output_price, args.verbose)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate booking query parsers")
+    parser.add_argument("--dataset", type=Path, default=DEFAULT_DATASET, help="NDJSON of {query, expected}")
+    parser.add_argument("--parser", nargs="+", default=["openai", "rule", "router"],
+                        choices=["openai", "rule", "router"])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate-limit", type=float, default=5.0, help="max live LLM calls per second")
+    parser.add_argument("--cassette", type=Path, default=DEFAULT_CASSETTE)
+    parser.add_argument("--record", choices=["none", "new", "all"], default="new",
+                        help="none: replay only; new: record cassette misses; all: re-record everything")
+    parser.add_argument("--input-price", type=float, default=DEFAULT_INPUT_PRICE, help="USD per 1M input tokens")
+    parser.add_argument("--output-price", type=float, default=DEFAULT_OUTPUT_PRICE, help="USD per 1M output tokens")
+    parser.add_argument("--verbose", action="store_true", help="print every non-passing result")
+    args = parser.parse_args()
+
+    asyncio.run(evaluate(args))
 
 
 if __name__ == "__main__":
-    asyncio.run(evaluate())
+    main()
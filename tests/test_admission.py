@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.admission import AdmissionController, Overloaded
+from app.deadline import (Deadline, DeadlineExceeded, current_deadline,
+                          deadline_scope)
+
+
+@pytest.mark.asyncio
+async def test_deadline_scope_cancels_work_and_is_visible_in_threads():
+    deadline = Deadline(0.05)
+    seen = []
+
+    with pytest.raises(DeadlineExceeded):
+        async with deadline_scope(deadline):
+            seen.append(await asyncio.to_thread(current_deadline))
+            await asyncio.sleep(5)
+
+    assert seen == [deadline]
+    assert current_deadline() is None
+    with pytest.raises(DeadlineExceeded):
+        deadline.clamp(10.0)
+
+
+@pytest.mark.asyncio
+async def test_admission_queues_up_to_the_limit_then_rejects():
+    admission = AdmissionController(max_concurrency=1, max_queue=1, request_timeout=5.0)
+    release = asyncio.Event()
+    order = []
+
+    async def query(name: str) -> None:
+        async with admission.admit(Deadline(5.0)):
+            order.append(name)
+            await release.wait()
+
+    running = asyncio.create_task(query("running"))
+    queued = asyncio.create_task(query("queued"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(Overloaded):
+        await query("rejected")
+
+    release.set()
+    await asyncio.gather(running, queued)
+
+    assert order == ["running", "queued"]
+    assert admission.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_gives_up_on_queued_requests_past_their_deadline():
+    admission = AdmissionController(max_concurrency=1, max_queue=1, request_timeout=5.0)
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        async with admission.admit(Deadline(5.0)):
+            await release.wait()
+
+    running = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    with pytest.raises(DeadlineExceeded):
+        async with admission.admit(Deadline(0.05)):
+            pass
+
+    release.set()
+    await running
+    assert admission.in_flight == 0
@@ -1,11 +1,45 @@
+import asyncio
 import os
+import subprocess
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 
 from fastapi.testclient import TestClient
 
-os.environ["OPENAI_API_KEY"] = ""
+from app.admission import AdmissionController
+from app.agent import BookingQueryAgent
+from app.deadline import Deadline, DeadlineExceeded, deadline_scope
+from app.main import app, get_admission, get_agent
+from app.models import Booking
+from app.query_parser import (BookingQueryInterpreter, OpenAIQueryParser,
+                              RuleBasedQueryParser)
+from app.services import BookingService
+from tests.test_booking_service import FakeBookingRepository, FakeFXClient
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _fake_agent() -> BookingQueryAgent:
+    repo = FakeBookingRepository(
+        [Booking(id="1", check_in=date(2024, 11, 1), currency="EUR", amount=120.5)]
+    )
+    service = BookingService(repo=repo, fx_client=FakeFXClient(rate=1.0))
+    return BookingQueryAgent(BookingQueryInterpreter(RuleBasedQueryParser()), service)
 
-from app.main import app
 
+class SlowBookingRepository(FakeBookingRepository):
+    async def get_bookings_between(self, start_date: date, end_date: date):
+        await asyncio.sleep(5)
+        return []
+
+
+app.dependency_overrides[get_agent] = _fake_agent
+app.dependency_overrides[get_admission] = lambda: AdmissionController(4, 4, request_timeout=5.0)
 client = TestClient(app)
 
 
@@ -14,9 +48,98 @@ def test_query_endpoint_basic_flow():
 
     response = client.post("/query", json=payload)
 
-    assert response.status_code in (200, 400)
+    assert response.status_code == 200
     data = response.json()
 
     assert "message" in data
-    assert "total_value" in data
-    assert "currency" in data
+    assert data["total_value"] == 120.5
+    assert data["currency"] == "EUR"
+
+
+def test_query_endpoint_rejects_unparseable_query():
+    response = client.post("/query", json={"query": "just some random text"})
+
+    assert response.status_code == 400
+    assert "Could not parse query" in response.json()["detail"]
+
+
+def test_query_endpoint_returns_503_when_admission_is_full():
+    app.dependency_overrides[get_admission] = lambda: AdmissionController(0, 0, request_timeout=5.0)
+    try:
+        response = client.post("/query", json={"query": "Show me bookings in November 2024"})
+    finally:
+        app.dependency_overrides[get_admission] = lambda: AdmissionController(4, 4, request_timeout=5.0)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_query_endpoint_returns_504_once_the_deadline_passes():
+    service = BookingService(repo=SlowBookingRepository([]), fx_client=FakeFXClient(rate=1.0))
+    slow_agent = BookingQueryAgent(BookingQueryInterpreter(RuleBasedQueryParser()), service)
+
+    app.dependency_overrides[get_agent] = lambda: slow_agent
+    app.dependency_overrides[get_admission] = lambda: AdmissionController(4, 4, request_timeout=0.05)
+    try:
+        response = client.post("/query", json={"query": "Show me bookings in November 2024"})
+    finally:
+        app.dependency_overrides[get_agent] = _fake_agent
+        app.dependency_overrides[get_admission] = lambda: AdmissionController(4, 4, request_timeout=5.0)
+
+    assert response.status_code == 504
+
+
+def test_importing_app_is_cheap_and_needs_no_settings():
+    env = {k: v for k, v in os.environ.items() if not k.startswith(("TURNEO_", "OPENAI_", "FX_"))}
+    code = "import sys, app.main; print('openai' in sys.modules)"
+
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert out.stdout.strip() == "False"
+
+
+class SlowOpenAI:
+    """Stands in for the SDK: honours the per-call timeout, then gives up."""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        time.sleep(kwargs["timeout"])
+        raise TimeoutError("Request timed out.")
+
+
+def _llm_agent() -> BookingQueryAgent:
+    parser = OpenAIQueryParser(api_key="test", client=SlowOpenAI())
+    service = BookingService(repo=FakeBookingRepository([]), fx_client=FakeFXClient(rate=1.0))
+    return BookingQueryAgent(BookingQueryInterpreter(parser), service)
+
+
+def test_query_endpoint_returns_504_when_the_llm_call_outlives_the_deadline():
+    app.dependency_overrides[get_agent] = _llm_agent
+    app.dependency_overrides[get_admission] = lambda: AdmissionController(4, 4, request_timeout=0.1)
+    try:
+        response = client.post("/query", json={"query": "Show me bookings in November 2024"})
+    finally:
+        app.dependency_overrides[get_agent] = _fake_agent
+        app.dependency_overrides[get_admission] = lambda: AdmissionController(4, 4, request_timeout=5.0)
+
+    assert response.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_llm_timeout_at_the_deadline_is_not_answered_by_the_fallback():
+    interpreter = BookingQueryInterpreter(OpenAIQueryParser(api_key="test", client=SlowOpenAI()))
+
+    # Calling _parse on the loop thread keeps asyncio.timeout from firing
+    # first, so this checks the parser's own handling of the SDK timeout.
+    with pytest.raises(DeadlineExceeded):
+        async with deadline_scope(Deadline(0.05)):
+            interpreter._parse("Show me bookings in November 2024")
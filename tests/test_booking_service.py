@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
-from typing import Iterable, List
+from typing import Dict, Iterable, List
 
 import pytest
 
@@ -65,3 +65,52 @@ async def test_booking_service_returns_zero_when_no_bookings():
 
     assert summary.currency == "EUR"
     assert summary.total_value == 0.0
+
+
+class PeriodBookingRepository(BookingRepository):
+    def __init__(self, by_start: Dict[date, List[Booking]]):
+        self._by_start = by_start
+
+    async def get_bookings_between(self, start_date: date, end_date: date) -> Iterable[Booking]:
+        return self._by_start.get(start_date, [])
+
+
+@dataclass
+class CountingFXClient:
+    rate: float
+    calls: List[str] = field(default_factory=list)
+
+    async def get_rate(self, from_currency: str, to_currency: str) -> float:
+        self.calls.append(from_currency)
+        return self.rate
+
+
+@pytest.mark.asyncio
+async def test_booking_service_compares_periods_with_one_fx_lookup_per_currency():
+    repo = PeriodBookingRepository({
+        date(2024, 11, 1): [
+            Booking(id="1", check_in=date(2024, 11, 1), currency="EUR", amount=100.0),
+            Booking(id="2", check_in=date(2024, 11, 2), currency="USD", amount=50.0),
+        ],
+        date(2023, 11, 1): [
+            Booking(id="3", check_in=date(2023, 11, 1), currency="USD", amount=75.0),
+        ],
+    })
+    fx_client = CountingFXClient(rate=2.0)
+    service = BookingService(repo=repo, fx_client=fx_client)
+
+    filters = QueryFilters(
+        start_date=date(2024, 11, 1),
+        end_date=date(2024, 11, 30),
+        target_currency="EUR",
+        compare_start_date=date(2023, 11, 1),
+        compare_end_date=date(2023, 11, 30),
+    )
+
+    comparison = await service.compare_bookings(filters)
+
+    assert comparison.current.total_value == 200.0
+    assert comparison.previous.total_value == 150.0
+    assert comparison.delta_value == 50.0
+    assert comparison.delta_percent == 33.33
+    assert fx_client.calls == ["USD"]
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app.cache import InMemoryCacheBackend, SQLiteCacheBackend
+
+
+def _counting_compute(calls, value=b"value", delay=0.05):
+    async def compute() -> bytes:
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return compute
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_computes_once_for_concurrent_callers():
+    cache = InMemoryCacheBackend()
+    calls = []
+
+    results = await asyncio.gather(
+        *(cache.get_or_compute("k", _counting_compute(calls)) for _ in range(10))
+    )
+
+    assert results == [b"value"] * 10
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_expires_entries():
+    cache = InMemoryCacheBackend()
+
+    await cache.set("k", b"v", ttl=0.01)
+    assert await cache.get("k") == b"v"
+
+    await asyncio.sleep(0.02)
+    assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used_past_its_byte_budget():
+    cache = InMemoryCacheBackend(max_bytes=100)
+
+    await cache.set("a", b"x" * 40)
+    await cache.set("b", b"x" * 40)
+    await cache.get("a")
+    await cache.set("c", b"x" * 40)  # over budget: "b" is the least recently used
+    await cache.set("a", b"x" * 10)  # replacing a value releases its old size
+    await cache.set("huge", b"x" * 101)
+
+    assert await cache.get("b") is None
+    assert await cache.get("huge") is None
+    assert await cache.get("a") == b"x" * 10
+    assert await cache.get("c") == b"x" * 40
+    assert cache.nbytes == 50
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_shares_one_compute_across_instances(tmp_path):
+    # Separate instances stand in for separate worker processes: each has its
+    # own connection and lease owner id.
+    path = str(tmp_path / "cache.sqlite3")
+    workers = [SQLiteCacheBackend(path, poll_interval=0.01) for _ in range(4)]
+    calls = []
+
+    try:
+        results = await asyncio.gather(
+            *(w.get_or_compute("bookings:2024-11", _counting_compute(calls), ttl=60) for w in workers)
+        )
+    finally:
+        for w in workers:
+            await w.aclose()
+
+    assert results == [b"value"] * 4
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_releases_lease_when_compute_fails(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = SQLiteCacheBackend(path)
+    second = SQLiteCacheBackend(path)
+
+    async def failing() -> bytes:
+        raise RuntimeError("upstream down")
+
+    try:
+        with pytest.raises(RuntimeError):
+            await first.get_or_compute("k", failing)
+
+        calls = []
+        assert await second.get_or_compute("k", _counting_compute(calls, delay=0)) == b"value"
+        assert await first.get("k") == b"value"
+        assert len(calls) == 1
+    finally:
+        await first.aclose()
+        await second.aclose()
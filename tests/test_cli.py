@@ -0,0 +1,45 @@
+import asyncio
+import io
+import json
+from datetime import date
+
+import pytest
+
+from app.agent import BookingQueryAgent
+from app.cli import run_batch
+from app.models import Booking
+from app.query_parser import BookingQueryInterpreter, RuleBasedQueryParser
+from app.services import BookingService
+from tests.test_booking_service import FakeBookingRepository, FakeFXClient
+
+
+class SlowEarlyMonthsRepository(FakeBookingRepository):
+    async def get_bookings_between(self, start_date: date, end_date: date):
+        # Earlier months answer last, so output order must not follow completion order.
+        await asyncio.sleep((13 - start_date.month) * 0.005)
+        return self._bookings
+
+
+@pytest.mark.asyncio
+async def test_run_batch_streams_results_in_input_order():
+    repo = SlowEarlyMonthsRepository(
+        [Booking(id="1", check_in=date(2024, 1, 1), currency="EUR", amount=10.0)]
+    )
+    service = BookingService(repo=repo, fx_client=FakeFXClient(rate=1.0))
+    agent = BookingQueryAgent(BookingQueryInterpreter(RuleBasedQueryParser()), service)
+
+    months = ["January", "February", "March", "April", "May", "June"]
+    lines = [json.dumps({"id": i, "query": f"Bookings in {m} 2024"}) for i, m in enumerate(months)]
+    lines.insert(2, "not json")
+    lines.insert(4, "")
+    source = io.StringIO("\n".join(lines) + "\n")
+    sink = io.StringIO()
+
+    stats = await run_batch(agent, source, sink, concurrency=2)
+
+    rows = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [row.get("id") for row in rows] == [0, 1, None, 2, 3, 4, 5]
+    assert rows[0]["start_date"] == "2024-01-01"
+    assert rows[0]["total_value"] == 10.0
+    assert "error" in rows[2]
+    assert (stats.ok, stats.failed) == (6, 1)
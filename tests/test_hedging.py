@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from app.hedging import RequestHedger
+from app.metrics import metrics
+
+
+def _warm(hedger: RequestHedger, endpoint: str, seconds: float, count: int) -> None:
+    for _ in range(count):
+        hedger._record(endpoint, seconds)
+
+
+@pytest.mark.asyncio
+async def test_hedger_duplicates_slow_requests_and_takes_the_first_answer():
+    metrics.reset()
+    hedger = RequestHedger("test", budget_ratio=1.0, min_delay=0.05, min_samples=5)
+    _warm(hedger, "/bookings", 0.05, 5)
+    calls = []
+    cancelled = []
+
+    async def send() -> str:
+        attempt = len(calls)
+        calls.append(attempt)
+        try:
+            # The first copy straggles, the hedge is fast.
+            await asyncio.sleep(5 if attempt == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return f"attempt {attempt}"
+
+    result = await hedger.run("/bookings", send)
+
+    assert result == "attempt 1"
+    assert cancelled == [0]
+    assert metrics.counter("upstream_hedges_total", upstream="test", endpoint="/bookings") == 1
+    assert metrics.counter("upstream_hedge_wins_total", upstream="test", endpoint="/bookings") == 1
+    # The sample covers the wait before hedging, not just the hedge itself.
+    assert hedger._latencies["/bookings"][-1] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_hedger_respects_the_budget():
+    metrics.reset()
+    hedger = RequestHedger("test", budget_ratio=0.5, min_delay=0.001, min_samples=3)
+    _warm(hedger, "/bookings", 0.001, 200)
+    calls = 0
+
+    async def send() -> None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+
+    for _ in range(7):
+        await hedger.run("/bookings", send)
+
+    # Every request is slower than the threshold, but 7 requests only earn 3.5 tokens.
+    labels = {"upstream": "test", "endpoint": "/bookings"}
+    assert metrics.counter("upstream_hedges_total", **labels) == 3
+    assert metrics.counter("upstream_hedges_skipped_total", reason="budget", **labels) == 4
+    assert calls == 10
+
+
+def test_hedger_has_no_threshold_until_it_has_enough_samples():
+    hedger = RequestHedger("test", min_delay=0.05, min_samples=3)
+    _warm(hedger, "/bookings", 0.2, 2)
+
+    assert hedger.threshold("/bookings") is None
+    _warm(hedger, "/bookings", 0.2, 1)
+    assert hedger.threshold("/bookings") == 0.2
+    assert hedger.threshold("/other") is None
+
+
+@pytest.mark.asyncio
+async def test_hedger_reports_the_original_error_when_both_copies_fail():
+    hedger = RequestHedger("test", budget_ratio=1.0, min_delay=0.001, min_samples=1)
+    _warm(hedger, "/bookings", 0.001, 1)
+    calls = []
+
+    async def send() -> None:
+        attempt = len(calls)
+        calls.append(attempt)
+        await asyncio.sleep(0.01)
+        raise RuntimeError(f"attempt {attempt} failed")
+
+    with pytest.raises(RuntimeError, match="attempt 0 failed"):
+        await hedger.run("/bookings", send)
+    assert len(calls) == 2
@@ -0,0 +1,116 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+
+from app.cache import InMemoryCacheBackend
+from app.deadline import Deadline, deadline_scope
+from app.hedging import RequestHedger
+from app.http_cache import ConditionalFetcher
+from app.metrics import metrics
+
+PAGE = json.dumps({"results": [{"id": i} for i in range(200)], "next": None}).encode()
+
+
+def _server(seen):
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(
+            200,
+            stream=httpx.ByteStream(gzip.compress(PAGE)),
+            headers={"ETag": '"v1"', "Content-Encoding": "gzip"},
+        )
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_conditional_fetcher_reuses_stored_page_on_304():
+    metrics.reset()
+    seen = []
+    fetcher = ConditionalFetcher("test", cache=InMemoryCacheBackend())
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_server(seen))) as client:
+        first = await fetcher.get(client, "https://api.example.com/bookings", params={"page": 1})
+        second = await fetcher.get(client, "https://api.example.com/bookings", params={"page": 1})
+
+    assert first == second == PAGE
+    assert "gzip" in seen[0].headers["Accept-Encoding"]
+    assert "If-None-Match" not in seen[0].headers
+    assert seen[1].headers["If-None-Match"] == '"v1"'
+    assert metrics.counter("upstream_not_modified_total", upstream="test") == 1
+    wire_bytes = len(gzip.compress(PAGE))
+    assert metrics.counter("upstream_bytes_received_total", upstream="test") == wire_bytes
+    assert metrics.counter("upstream_bytes_saved_total", upstream="test") == wire_bytes
+    assert metrics.counter("upstream_bytes_decoded_total", upstream="test") == len(PAGE)
+
+
+@pytest.mark.asyncio
+async def test_conditional_fetcher_keeps_namespaces_apart():
+    seen = []
+    cache = InMemoryCacheBackend()
+    account_a = ConditionalFetcher("test", cache=cache, namespace="a")
+    account_b = ConditionalFetcher("test", cache=cache, namespace="b")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_server(seen))) as client:
+        await account_a.get(client, "https://api.example.com/bookings")
+        await account_b.get(client, "https://api.example.com/bookings")
+
+    assert "If-None-Match" not in seen[1].headers
+
+
+@pytest.mark.asyncio
+async def test_conditional_fetcher_raises_on_error_status():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, text="boom")
+
+    fetcher = ConditionalFetcher("test", cache=InMemoryCacheBackend())
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await fetcher.get(client, "https://api.example.com/bookings")
+
+
+@pytest.mark.asyncio
+async def test_conditional_fetcher_caps_timeouts_to_the_request_deadline():
+    seen = []
+    fetcher = ConditionalFetcher("test")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(_server(seen)), timeout=10.0) as client:
+        await fetcher.get(client, "https://api.example.com/bookings")
+        async with deadline_scope(Deadline(2.0)):
+            await fetcher.get(client, "https://api.example.com/bookings")
+
+    assert seen[0].extensions["timeout"]["read"] == 10.0
+    assert 0 < seen[1].extensions["timeout"]["read"] <= 2.0
+
+
+@pytest.mark.asyncio
+async def test_conditional_fetcher_hedges_with_a_fresh_request_per_host_and_path():
+    metrics.reset()
+    seen = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        # The first copy straggles, the hedge is fast.
+        await asyncio.sleep(5 if len(seen) == 1 else 0.01)
+        return httpx.Response(200, content=PAGE)
+
+    hedger = RequestHedger("test", budget_ratio=1.0, min_delay=0.01, min_samples=1)
+    hedger._record("api.example.com/bookings", 0.01)
+    fetcher = ConditionalFetcher("test", hedger=hedger)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        body = await fetcher.get(client, "https://api.example.com/bookings", params={"page": 2})
+
+    assert body == PAGE
+    assert len(seen) == 2
+    assert seen[0] is not seen[1]
+    assert seen[0].url == seen[1].url
+    assert seen[1].headers["Accept-Encoding"] == seen[0].headers["Accept-Encoding"]
+    labels = {"upstream": "test", "endpoint": "api.example.com/bookings"}
+    assert metrics.counter("upstream_hedge_wins_total", **labels) == 1
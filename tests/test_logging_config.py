@@ -0,0 +1,71 @@
+import io
+import json
+import logging
+
+from app.logging_config import (JsonFormatter, SamplingFilter,
+                                configure_logging, shutdown_logging)
+
+
+def _record(msg: str, *args) -> logging.LogRecord:
+    return logging.LogRecord("app.test", logging.WARNING, __file__, 1, msg, args, None)
+
+
+def test_sampling_filter_limits_each_message_type_and_reports_drops():
+    sampler = SamplingFilter(burst=2, interval=60.0)
+
+    kept = [sampler.filter(_record("Skipped item %s", i)) for i in range(5)]
+    other = sampler.filter(_record("Another message"))
+
+    assert kept == [True, True, False, False, False]
+    assert other is True
+
+    # Once the window has passed, the next record carries the drop count.
+    sampler.interval = 0.0
+    record = _record("Skipped item %s", 5)
+    assert sampler.filter(record) is True
+    assert record.suppressed == 3
+
+
+def test_json_formatter_includes_extra_fields():
+    record = _record("Fetched %d pages", 3)
+    record.account = "eu"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["level"] == "WARNING"
+    assert entry["logger"] == "app.test"
+    assert entry["message"] == "Fetched 3 pages"
+    assert entry["account"] == "eu"
+
+
+def test_configure_logging_writes_through_the_queue():
+    stream = io.StringIO()
+    configure_logging(fmt="json", sample_burst=1, stream=stream)
+    try:
+        logger = logging.getLogger("app.test")
+        for i in range(3):
+            logger.warning("Repeated %s", i)
+        shutdown_logging()  # flushes the queue
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line["message"] for line in lines] == ["Repeated 0"]
+    finally:
+        shutdown_logging()
+
+
+def test_exceptions_are_formatted_by_the_listener_as_their_own_field():
+    stream = io.StringIO()
+    configure_logging(fmt="json", stream=stream)
+    try:
+        try:
+            raise RuntimeError("upstream down")
+        except RuntimeError:
+            logging.getLogger("app.test").exception("boom %s", 1)
+        shutdown_logging()
+
+        entry = json.loads(stream.getvalue())
+        assert entry["message"] == "boom 1"
+        assert "Traceback" in entry["exc_info"]
+        assert "RuntimeError: upstream down" in entry["exc_info"]
+    finally:
+        shutdown_logging()
@@ -0,0 +1,117 @@
+from datetime import date
+
+from app.models import Booking, BookingBatch, _Interner
+
+
+def test_booking_batch_round_trips_bookings():
+    batch = BookingBatch()
+    batch.append("bk_1", date(2024, 11, 1), "eur", 100.10)
+    batch.append("bk_2", date(2024, 11, 2), "USD", 19.99)
+    batch.append("bk_3", date(2024, 11, 3), "JPY", 1500)
+
+    assert len(batch) == 3
+    assert list(batch) == [
+        Booking(id="bk_1", check_in=date(2024, 11, 1), currency="EUR", amount=100.10),
+        Booking(id="bk_2", check_in=date(2024, 11, 2), currency="USD", amount=19.99),
+        Booking(id="bk_3", check_in=date(2024, 11, 3), currency="JPY", amount=1500.0),
+    ]
+    assert batch[-1].id == "bk_3"
+    assert batch.currencies == ["EUR", "USD", "JPY"]
+
+
+def test_booking_batch_totals_are_exact_in_minor_units():
+    batch = BookingBatch()
+    for i in range(10):
+        batch.append(str(i), date(2024, 11, 1), "EUR", 0.1)
+    batch.append("usd", date(2024, 11, 1), "USD", 5.0)
+
+    assert batch.totals_by_currency() == {"EUR": 1.0, "USD": 5.0}
+
+
+def test_booking_batch_rejects_bad_rows_without_partial_writes():
+    batch = BookingBatch()
+    batch.append("ok", date(2024, 11, 1), "EUR", 1.0)
+
+    try:
+        batch.append("bad", None, "GBP", 1.0)  # type: ignore[arg-type]
+        assert False, "Expected AttributeError"
+    except AttributeError:
+        pass
+
+    for amount in (1e20, 1e300, float("inf")):
+        try:
+            batch.append("huge", date(2024, 11, 2), "GBP", amount)
+            assert False, "Expected OverflowError"
+        except OverflowError:
+            pass
+
+    assert len(batch) == 1
+    assert len(batch._amounts) == len(batch._days) == len(batch._currency_idx) == 1
+    assert batch.currencies == ["EUR"]
+    assert batch[0].id == "ok"
+
+    batch.append("next", date(2024, 11, 3), "EUR", 2.0)
+    assert [b.check_in for b in batch] == [date(2024, 11, 1), date(2024, 11, 3)]
+
+
+def test_booking_is_slotted():
+    booking = Booking(id="1", check_in=date(2024, 11, 1), currency="EUR", amount=1.0)
+
+    assert not hasattr(booking, "__dict__")
+
+
+def test_booking_batch_extend_retags_accounts_and_survives_serialization():
+    eu = BookingBatch()
+    eu.append("a", date(2024, 11, 1), "EUR", 10.0)
+    us = BookingBatch()
+    us.append("a", date(2024, 11, 2), "USD", 5.0)
+    us.append("b", date(2024, 11, 3), "EUR", 1.0)
+
+    combined = BookingBatch()
+    combined.extend(eu, account="eu")
+    combined.extend(us, account="us")
+    restored = BookingBatch.from_bytes(combined.to_bytes())
+
+    assert [(b.account, b.id, b.currency, b.amount) for b in restored] == [
+        ("eu", "a", "EUR", 10.0),
+        ("us", "a", "USD", 5.0),
+        ("us", "b", "EUR", 1.0),
+    ]
+    assert restored.totals_by_account_currency() == {
+        "eu": {"EUR": 10.0},
+        "us": {"USD": 5.0, "EUR": 1.0},
+    }
+
+
+def test_booking_batch_extend_rejects_overflow_without_partial_writes(monkeypatch):
+    combined = BookingBatch()
+    combined.append("ok", date(2024, 11, 1), "EUR", 1.0, account="eu")
+    # Leave exactly one free slot in the uint16 account index.
+    combined._accounts = _Interner(["", "eu"] + [f"acct_{i}" for i in range(65533)])
+
+    us = BookingBatch()
+    us.append("a", date(2024, 11, 2), "GBP", 5.0)
+    combined.extend(us, account="us")
+    assert combined[-1].account == "us"
+
+    two_new_accounts = BookingBatch()
+    two_new_accounts.append("b", date(2024, 11, 3), "CHF", 5.0, account="x")
+    two_new_accounts.append("c", date(2024, 11, 3), "CHF", 5.0, account="y")
+    try:
+        combined.extend(two_new_accounts)
+        assert False, "Expected OverflowError"
+    except OverflowError:
+        pass
+
+    monkeypatch.setattr("app.models._UINT32_MAX", len(combined._id_data))
+    try:
+        combined.extend(us)
+        assert False, "Expected OverflowError"
+    except OverflowError:
+        pass
+
+    assert len(combined) == 2
+    assert len(combined._amounts) == len(combined._currency_idx) == len(combined._account_idx) == 2
+    assert len(combined._id_offsets) == 3
+    assert combined.currencies == ["EUR", "GBP"]
+    assert "x" not in combined._accounts.lookup
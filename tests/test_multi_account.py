@@ -0,0 +1,86 @@
+import asyncio
+import time
+from datetime import date
+
+import pytest
+
+from app.models import Booking, BookingBatch, QueryFilters
+from app.repositories import MultiAccountBookingRepository
+from app.services import BookingService
+from tests.test_booking_service import FakeFXClient
+
+
+class SlowAccountRepository:
+    def __init__(self, bookings, delay=0.1):
+        self.bookings = bookings
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_bookings_between(self, start_date, end_date):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return BookingBatch.from_bookings(self.bookings)
+        finally:
+            self.in_flight -= 1
+
+
+def _booking(id, currency, amount):
+    return Booking(id=id, check_in=date(2024, 11, 1), currency=currency, amount=amount)
+
+
+FILTERS = QueryFilters(start_date=date(2024, 11, 1), end_date=date(2024, 11, 30), target_currency="EUR")
+
+
+@pytest.mark.asyncio
+async def test_multi_account_repository_fans_out_concurrently_and_tags_bookings():
+    repo = MultiAccountBookingRepository(
+        {
+            "eu": SlowAccountRepository([_booking("1", "EUR", 100.0)]),
+            "us": SlowAccountRepository([_booking("1", "USD", 50.0), _booking("2", "USD", 25.0)]),
+            "empty": SlowAccountRepository([]),
+        }
+    )
+
+    started = time.perf_counter()
+    bookings = await repo.get_bookings_between(FILTERS.start_date, FILTERS.end_date)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.2
+    assert [(b.account, b.id, b.currency) for b in bookings] == [
+        ("eu", "1", "EUR"),
+        ("us", "1", "USD"),
+        ("us", "2", "USD"),
+    ]
+    assert bookings.accounts == ["eu", "us", "empty"]
+
+
+@pytest.mark.asyncio
+async def test_multi_account_repository_limits_concurrency_per_account():
+    account = SlowAccountRepository([_booking("1", "EUR", 1.0)], delay=0.02)
+    repo = MultiAccountBookingRepository({"eu": account}, max_concurrency_per_account=2)
+
+    await asyncio.gather(
+        *(repo.get_bookings_between(FILTERS.start_date, FILTERS.end_date) for _ in range(6))
+    )
+
+    assert account.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_booking_service_reports_combined_and_per_account_totals():
+    repo = MultiAccountBookingRepository(
+        {
+            "eu": SlowAccountRepository([_booking("1", "EUR", 100.0)], delay=0),
+            "us": SlowAccountRepository([_booking("1", "USD", 50.0)], delay=0),
+            "empty": SlowAccountRepository([], delay=0),
+        }
+    )
+    service = BookingService(repo=repo, fx_client=FakeFXClient(rate=2.0))
+
+    summary = await service.summarize_bookings(FILTERS)
+
+    assert summary.total_value == 200.0
+    assert summary.per_account == {"eu": 100.0, "us": 100.0, "empty": 0.0}
@@ -1,4 +1,10 @@
-from app.query_parser import RuleBasedQueryParser
+from datetime import date
+
+import pytest
+
+from app.cache import InMemoryCacheBackend
+from app.query_parser import (BookingQueryInterpreter, BookingQueryParser,
+                              ParsedQuery, RuleBasedQueryParser)
 
 
 def test_rule_based_parser_parses_month_and_year_with_currency():
@@ -30,3 +36,87 @@ def test_rule_based_parser_raises_on_unparseable_query():
         assert False, "Expected ValueError"
     except ValueError as e:
         assert "Could not parse query" in str(e)
+
+
+def test_rule_based_parser_parses_month_over_month_comparison():
+    parser = RuleBasedQueryParser()
+
+    parsed = parser.parse_booking_query("November 2024 vs November 2023 in USD")
+
+    assert parsed["start_date"] == "2024-11-01"
+    assert parsed["end_date"] == "2024-11-30"
+    assert parsed["compare_start_date"] == "2023-11-01"
+    assert parsed["compare_end_date"] == "2023-11-30"
+    assert parsed["currency"] == "USD"
+
+
+def test_rule_based_parser_resolves_relative_months_against_today():
+    parser = RuleBasedQueryParser(today=lambda: date(2025, 1, 15))
+
+    parsed = parser.parse_booking_query("this month vs last month")
+
+    assert parsed["start_date"] == "2025-01-01"
+    assert parsed["end_date"] == "2025-01-31"
+    assert parsed["compare_start_date"] == "2024-12-01"
+    assert parsed["compare_end_date"] == "2024-12-31"
+
+
+@pytest.mark.parametrize("query", ["bookings last month", "this month in USD"])
+def test_rule_based_parser_rejects_relative_month_outside_comparisons(query):
+    parser = RuleBasedQueryParser(today=lambda: date(2025, 1, 15))
+
+    with pytest.raises(ValueError):
+        parser.parse_booking_query(query)
+
+
+class FlakyParser(BookingQueryParser):
+    """Fails on the first call, like an LLM call that timed out once."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def parse_booking_query(self, query: str) -> ParsedQuery:
+        self.calls += 1
+        if self.calls == 1:
+            raise ValueError("OpenAI call failed: Request timed out.")
+        return {"start_date": "2024-03-01", "end_date": "2024-03-15", "currency": "GBP"}
+
+
+@pytest.mark.asyncio
+async def test_interpreter_does_not_cache_fallback_answers():
+    primary = FlakyParser()
+    interpreter = BookingQueryInterpreter(primary, cache=InMemoryCacheBackend())
+    query = "Bookings from 1 March 2024 to 15 March 2024 in GBP"
+
+    degraded = await interpreter.interpret(query)
+    retried = await interpreter.interpret(query)
+    cached = await interpreter.interpret(query)
+
+    # The rule-based fallback only understands whole months.
+    assert degraded.end_date == date(2024, 3, 31)
+    assert retried.end_date == date(2024, 3, 15)
+    assert cached.end_date == date(2024, 3, 15)
+    assert primary.calls == 2
+
+
+class ModelParser(BookingQueryParser):
+    def __init__(self, model: str):
+        self.model = model
+        self.calls = 0
+
+    def parse_booking_query(self, query: str) -> ParsedQuery:
+        self.calls += 1
+        return {"start_date": "2024-03-01", "end_date": "2024-03-31", "currency": "EUR"}
+
+
+@pytest.mark.asyncio
+async def test_interpreter_cache_is_keyed_by_model():
+    cache = InMemoryCacheBackend()
+    mini, full = ModelParser("gpt-4o-mini"), ModelParser("gpt-4o")
+    query = "Bookings in March 2024"
+
+    await BookingQueryInterpreter(mini, cache=cache).interpret(query)
+    await BookingQueryInterpreter(mini, cache=cache).interpret(query)
+    await BookingQueryInterpreter(full, cache=cache).interpret(query)
+
+    assert (mini.calls, full.calls) == (1, 1)
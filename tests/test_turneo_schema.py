@@ -0,0 +1,87 @@
+import json
+from datetime import date
+from typing import List
+
+import pytest
+
+from app.repositories import TurneoBookingRepository
+from app.turneo_schema import BookingRecord, decode_booking_page
+
+
+def _item(id, local_time="2024-11-05T10:00:00", amount=100.0, currency="EUR"):
+    return {
+        "id": id,
+        "localTime": local_time,
+        "status": "confirmed",
+        "customer": {"name": "Jane", "emails": ["jane@example.com"]},
+        "price": {
+            "finalRetailPrice": {"amount": amount, "currency": currency},
+            "commission": {"amount": 10.0, "currency": currency},
+        },
+    }
+
+
+def test_decode_booking_page_reads_only_needed_fields():
+    content = json.dumps(
+        {"results": [_item("bk_1"), _item(2, amount="19.5")], "next": "https://x/bookings?page=2"}
+    ).encode()
+
+    page = decode_booking_page(content)
+
+    assert page.next == "https://x/bookings?page=2"
+    assert [r.id for r in page.results] == ["bk_1", 2]
+    assert page.results[0].price.final_retail_price.amount == 100.0
+    assert page.results[1].price.final_retail_price.amount == "19.5"
+
+
+def test_decode_booking_page_skips_malformed_items_only():
+    content = json.dumps(
+        {"results": [_item("bk_1"), {"localTime": "2024-11-05"}, _item("bk_3", amount=None)]}
+    ).encode()
+
+    page = decode_booking_page(content)
+
+    assert [r.id for r in page.results] == ["bk_1"]
+    assert page.next is None
+
+
+@pytest.mark.parametrize("results", [None, {"id": "bk_1"}, "oops"])
+def test_decode_booking_page_treats_non_list_results_as_empty(results):
+    content = json.dumps({"results": results, "next": "https://x/bookings?page=2"}).encode()
+
+    page = decode_booking_page(content)
+
+    assert page.results == []
+    assert page.next == "https://x/bookings?page=2"
+
+
+class FakeTurneoClient:
+    def __init__(self, records: List[BookingRecord]):
+        self.records = records
+
+    async def list_booking_records(self, start_date=None, end_date=None) -> List[BookingRecord]:
+        return self.records
+
+
+@pytest.mark.asyncio
+async def test_repository_maps_records_to_batch():
+    content = json.dumps(
+        {
+            "results": [
+                _item("bk_1", amount=100.0),
+                {"id": "bk_2", "time": "2024-11-06T09:00:00Z"},
+                {"id": "bk_3"},
+                _item("bk_4", local_time="not-a-date"),
+                {"id": "bk_5", "localTime": "2024-11-07T09:00:00", "price": None},
+                {"id": "bk_6", "localTime": "2024-11-08T09:00:00", "price": {"finalRetailPrice": None}},
+            ]
+        }
+    ).encode()
+    repo = TurneoBookingRepository(FakeTurneoClient(decode_booking_page(content).results))
+
+    bookings = await repo.get_bookings_between(date(2024, 11, 1), date(2024, 11, 30))
+
+    assert [(b.id, b.check_in, b.currency, b.amount) for b in bookings] == [
+        ("bk_1", date(2024, 11, 5), "EUR", 100.0),
+        ("bk_2", date(2024, 11, 6), "EUR", 0.0),
+    ]
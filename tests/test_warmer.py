@@ -0,0 +1,110 @@
+import asyncio
+from datetime import date
+from typing import List
+
+import pytest
+
+from app.cache import InMemoryCacheBackend
+from app.repositories import TurneoBookingRepository
+from app.turneo_schema import BookingRecord
+from app.warmer import CacheWarmer, resolve_period
+
+
+class CountingTurneoClient:
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    async def list_booking_records(self, start_date=None, end_date=None) -> List[BookingRecord]:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("Turneo API returned error status 503")
+        return [BookingRecord(id="1", local_time=f"{start_date.isoformat()}T10:00:00")]
+
+
+class RecordingFXClient:
+    def __init__(self, configured: bool = True):
+        self.configured = configured
+        self.bases: List[str] = []
+
+    def is_configured(self) -> bool:
+        return self.configured
+
+    async def refresh_rates(self, from_currency, to_currencies):
+        await asyncio.sleep(0.01)
+        self.bases.append(from_currency)
+        return {}
+
+
+def test_resolve_period_handles_year_boundaries():
+    assert resolve_period("this_month", date(2025, 1, 15)) == (date(2025, 1, 1), date(2025, 1, 31))
+    assert resolve_period("last_month", date(2025, 1, 15)) == (date(2024, 12, 1), date(2024, 12, 31))
+    assert resolve_period("2024-02") == (date(2024, 2, 1), date(2024, 2, 29))
+
+    with pytest.raises(ValueError):
+        resolve_period("next_week")
+
+
+@pytest.mark.asyncio
+async def test_warm_once_makes_user_queries_hit_the_cache():
+    cache = InMemoryCacheBackend()
+    client = CountingTurneoClient()
+    repo = TurneoBookingRepository(client, cache=cache)
+    fx = RecordingFXClient()
+    warmer = CacheWarmer(repo, fx, cache, ["this_month", "last_month"], ["EUR", "USD", "GBP"])
+
+    await warmer.warm_once()
+
+    assert client.calls == 2
+    assert sorted(fx.bases) == ["EUR", "GBP", "USD"]
+
+    start, end = resolve_period("this_month")
+    bookings = await repo.get_bookings_between(start, end)
+
+    assert len(bookings) == 1
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_warm_once_stops_on_upstream_error():
+    cache = InMemoryCacheBackend()
+    repo = TurneoBookingRepository(CountingTurneoClient(fail=True), cache=cache)
+    fx = RecordingFXClient()
+    warmer = CacheWarmer(repo, fx, cache, ["this_month"], ["EUR", "USD", "GBP"], concurrency=1)
+
+    with pytest.raises(ExceptionGroup):
+        await warmer.warm_once()
+
+    # The failing booking job runs first; with a budget of one the FX jobs
+    # are cancelled before they get to run.
+    assert fx.bases == []
+
+
+@pytest.mark.asyncio
+async def test_warmer_retries_failed_cycles_before_warmed_entries_expire(monkeypatch):
+    cache = InMemoryCacheBackend()
+    client = CountingTurneoClient(fail=True)
+    repo = TurneoBookingRepository(client, cache=cache)
+    warmer = CacheWarmer(
+        repo, RecordingFXClient(configured=False), cache, ["this_month"], ["EUR"],
+        interval=240.0, jitter=0.0, ttl=300.0,
+    )
+    delays: List[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        delays.append(delay)
+        if len(delays) > 8:
+            raise asyncio.CancelledError
+        if len(delays) == 6:
+            client.fail = False  # upstream recovers
+
+    monkeypatch.setattr("app.warmer.asyncio.sleep", fake_sleep)
+    with pytest.raises(asyncio.CancelledError):
+        await warmer._run()
+
+    # Initial jitter, then failures back off from 5s but stay below the TTL
+    # (300s), then the regular interval once a cycle succeeds.
+    assert delays[1:6] == [5.0, 10.0, 20.0, 40.0, 80.0]
+    assert delays[6] == 240.0
+    assert all(delay < 300.0 for delay in delays)
+    assert warmer._backoff(10) == 300.0